@@ -0,0 +1,28 @@
+"""
+Shared fixtures for the DroneWatch API test suite.
+The API directory is put on sys.path by pytest itself (`pythonpath` in pytest.ini).
+
+Safe under pytest-xdist (pytest -n auto --dist=loadfile): every worker is its
+own process, so session fixtures are per-worker and nothing here touches
+files or a DB.
+"""
+import pytest
+
+
+@pytest.fixture(scope="session")
+def handler_cls():
+    """incidents.handler, imported once per session"""
+    from incidents import handler
+    return handler
+
+
+class ByteSink:
+    """Minimal write-only stand-in for the handler's wfile"""
+
+    __slots__ = ('buf',)
+
+    def __init__(self):
+        self.buf = bytearray()
+
+    def write(self, data):
+        self.buf.extend(data)
@@ -5,14 +5,10 @@ Tests database connection, query optimization, and PostGIS operations.
 import pytest
 import asyncio
 from unittest.mock import Mock, patch, AsyncMock, MagicMock
-import sys
 import os
 from datetime import datetime, timezone
 from uuid import uuid4
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-
 from db import fetch_incidents, run_async
 from db_utils import get_connection
 
@@ -45,15 +41,19 @@ class MockAsyncPGConnection:
         self.closed = True
 
 
+# Fixed timestamp keeps mock rows deterministic (no clock reads per row)
+MOCK_ROW_TIME = datetime(2024, 10, 14, 12, 0, 0, tzinfo=timezone.utc)
+
+
 def create_mock_row(**kwargs):
     """Helper to create mock database row"""
     defaults = {
         "id": uuid4(),
         "title": "Test incident",
         "narrative": "Test narrative",
-        "occurred_at": datetime.now(timezone.utc),
-        "first_seen_at": datetime.now(timezone.utc),
-        "last_seen_at": datetime.now(timezone.utc),
+        "occurred_at": MOCK_ROW_TIME,
+        "first_seen_at": MOCK_ROW_TIME,
+        "last_seen_at": MOCK_ROW_TIME,
         "lat": 55.6181,
         "lon": 12.6560,
         "evidence_score": 3,
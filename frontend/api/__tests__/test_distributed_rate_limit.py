@@ -5,12 +5,8 @@ Tests rate limiting with mocked Redis responses, fallback behavior, and header g
 import pytest
 import time
 import os
-import sys
 from unittest.mock import Mock, patch, MagicMock
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-
 
 class MockRedisClient:
     """Mock Upstash Redis client for testing"""
@@ -5,16 +5,10 @@ Tests GET /api/incidents with various filters, error handling, and CORS.
 import pytest
 import json
 from unittest.mock import Mock, patch, AsyncMock
-from io import BytesIO
-import sys
-import os
 from datetime import datetime, timezone
 from uuid import uuid4
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-
-from incidents import handler
+from conftest import ByteSink
 
 
 # Default rate limit mock values (always allow requests)
@@ -26,6 +20,32 @@ DEFAULT_RATE_LIMIT_HEADERS = {
     'Retry-After': '60',
 }
 
+# Default incident sources, encoded once and shared by every mock row
+DEFAULT_SOURCES = [{
+    "source_url": "https://politi.dk/doegnet/2024/10/drone-copenhagen",
+    "source_type": "police",
+    "source_name": "Danish Police",
+    "trust_weight": 4
+}]
+DEFAULT_SOURCES_JSON = json.dumps(DEFAULT_SOURCES)
+
+# Canonical API response row; tests override only the fields they care about
+FIXED_OCCURRED_AT = datetime(2024, 1, 1, tzinfo=timezone.utc).isoformat()
+FIXED_INCIDENT_ID = "00000000-0000-0000-0000-000000000001"
+BASE_RESPONSE_ROW = {
+    "id": FIXED_INCIDENT_ID,
+    "title": "Test incident",
+    "evidence_score": 3,
+    "country": "DK",
+    "lat": 55.6181,
+    "lon": 12.6560,
+    "asset_type": "airport",
+    "status": "active",
+    "narrative": "Test",
+    "occurred_at": FIXED_OCCURRED_AT,
+    "sources": []
+}
+
 
 def mock_rate_limit_allow():
     """Context manager to mock rate limiter to always allow requests"""
@@ -84,7 +104,7 @@ class MockHTTPRequestHandler:
         self.response_code = None
         self.response_headers = {}
         self.response_body = None
-        self._wfile = BytesIO()
+        self._wfile = ByteSink()
 
     def send_response(self, code):
         self.response_code = code
@@ -99,8 +119,9 @@ class MockHTTPRequestHandler:
     def wfile(self):
         return self._wfile
 
-    def get_response_body(self):
-        return self._wfile.getvalue().decode('utf-8')
+    def response_json(self):
+        """Parse the JSON the handler wrote to wfile"""
+        return json.loads(self._wfile.buf)
 
 
 def create_mock_incident_row(
@@ -121,12 +142,7 @@ def create_mock_incident_row(
         occurred_at = datetime.now(timezone.utc)
 
     if sources is None:
-        sources = json.dumps([{
-            "source_url": "https://politi.dk/doegnet/2024/10/drone-copenhagen",
-            "source_type": "police",
-            "source_name": "Danish Police",
-            "trust_weight": 4
-        }])
+        sources = DEFAULT_SOURCES_JSON
 
     return {
         "id": incident_id or uuid4(),
@@ -149,7 +165,7 @@ class TestIncidentsAPIBasics:
     """Test basic API functionality and default behavior"""
 
     @pytest.mark.asyncio
-    async def test_get_incidents_default_params(self):
+    async def test_get_incidents_default_params(self, handler_cls):
         """Test GET /api/incidents with no filters returns incidents"""
         # Mock database returning 3 incidents
         mock_incidents = [
@@ -172,7 +188,7 @@ class TestIncidentsAPIBasics:
                         "country": inc["country"],
                         "asset_type": inc["asset_type"],
                         "status": inc["status"],
-                        "sources": json.loads(inc["sources"])
+                        "sources": DEFAULT_SOURCES
                     }
                     for inc in mock_incidents
                 ]
@@ -181,7 +197,7 @@ class TestIncidentsAPIBasics:
                 mock_request = MockHTTPRequestHandler(path='/api/incidents')
 
                 # Execute handler
-                h = handler()
+                h = handler_cls()
                 h.__dict__.update(mock_request.__dict__)
                 h.handle_get()
 
@@ -190,12 +206,12 @@ class TestIncidentsAPIBasics:
                 assert mock_request.response_headers['Content-Type'] == 'application/json'
 
                 # Parse response body
-                response_data = json.loads(mock_request.get_response_body())
+                response_data = mock_request.response_json()
                 assert len(response_data) == 3
                 assert response_data[0]['title'] == "Incident 1"
 
     @pytest.mark.asyncio
-    async def test_get_incidents_empty_result(self):
+    async def test_get_incidents_empty_result(self, handler_cls):
         """Test API returns empty array when no incidents match filters"""
         with mock_rate_limit_allow():
             with patch('incidents.run_async') as mock_run_async:
@@ -205,12 +221,12 @@ class TestIncidentsAPIBasics:
                     path='/api/incidents?min_evidence=4&country=XX'
                 )
 
-                h = handler()
+                h = handler_cls()
                 h.__dict__.update(mock_request.__dict__)
                 h.handle_get()
 
                 assert mock_request.response_code == 200
-                response_data = json.loads(mock_request.get_response_body())
+                response_data = mock_request.response_json()
                 assert response_data == []
 
 
@@ -218,7 +234,7 @@ class TestIncidentsFiltering:
     """Test query parameter filtering logic"""
 
     @pytest.mark.asyncio
-    async def test_get_incidents_with_evidence_filter(self):
+    async def test_get_incidents_with_evidence_filter(self, handler_cls):
         """Test min_evidence filter correctly passed to database query"""
         with mock_rate_limit_allow():
             with patch('incidents.fetch_incidents') as mock_fetch:
@@ -231,7 +247,7 @@ class TestIncidentsFiltering:
                         path='/api/incidents?min_evidence=3'
                     )
 
-                    h = handler()
+                    h = handler_cls()
                     h.__dict__.update(mock_request.__dict__)
                     h.handle_get()
 
@@ -240,7 +256,7 @@ class TestIncidentsFiltering:
                     assert mock_request.response_code == 200
 
     @pytest.mark.asyncio
-    async def test_get_incidents_with_country_filter(self):
+    async def test_get_incidents_with_country_filter(self, handler_cls):
         """Test country filter returns only matching incidents"""
         # Mock only Danish incidents
         mock_incidents = [
@@ -262,7 +278,7 @@ class TestIncidentsFiltering:
                         "status": inc["status"],
                         "narrative": inc["narrative"],
                         "occurred_at": inc["occurred_at"].isoformat(),
-                        "sources": json.loads(inc["sources"])
+                        "sources": DEFAULT_SOURCES
                     }
                     for inc in mock_incidents
                 ]
@@ -271,16 +287,16 @@ class TestIncidentsFiltering:
                     path='/api/incidents?country=DK'
                 )
 
-                h = handler()
+                h = handler_cls()
                 h.__dict__.update(mock_request.__dict__)
                 h.handle_get()
 
-                response_data = json.loads(mock_request.get_response_body())
+                response_data = mock_request.response_json()
                 assert len(response_data) == 2
                 assert all(inc["country"] == "DK" for inc in response_data)
 
     @pytest.mark.asyncio
-    async def test_get_incidents_with_status_filter(self):
+    async def test_get_incidents_with_status_filter(self, handler_cls):
         """Test status filter correctly filters incidents"""
         mock_request = MockHTTPRequestHandler(
             path='/api/incidents?status=active'
@@ -289,48 +305,24 @@ class TestIncidentsFiltering:
         with mock_rate_limit_allow():
             with patch('incidents.run_async') as mock_run_async:
                 mock_run_async.return_value = [
-                    {
-                        "id": str(uuid4()),
-                        "title": "Active incident",
-                        "status": "active",
-                        "evidence_score": 3,
-                        "country": "DK",
-                        "lat": 55.6181,
-                        "lon": 12.6560,
-                        "asset_type": "airport",
-                        "narrative": "Test",
-                        "occurred_at": datetime.now(timezone.utc).isoformat(),
-                        "sources": []
-                    }
+                    {**BASE_RESPONSE_ROW, "title": "Active incident"}
                 ]
 
-                h = handler()
+                h = handler_cls()
                 h.__dict__.update(mock_request.__dict__)
                 h.handle_get()
 
-                response_data = json.loads(mock_request.get_response_body())
+                response_data = mock_request.response_json()
                 assert all(inc["status"] == "active" for inc in response_data)
 
     @pytest.mark.asyncio
-    async def test_get_incidents_pagination(self):
+    async def test_get_incidents_pagination(self, handler_cls):
         """Test limit parameter restricts result count"""
         # Mock 100 incidents but limit to 10
         with mock_rate_limit_allow():
             with patch('incidents.run_async') as mock_run_async:
                 mock_run_async.return_value = [
-                    {
-                        "id": str(uuid4()),
-                        "title": f"Incident {i}",
-                        "evidence_score": 2,
-                        "country": "DK",
-                        "lat": 55.6 + i * 0.01,
-                        "lon": 12.6 + i * 0.01,
-                        "asset_type": "other",
-                        "status": "active",
-                        "narrative": f"Test incident {i}",
-                        "occurred_at": datetime.now(timezone.utc).isoformat(),
-                        "sources": []
-                    }
+                    {**BASE_RESPONSE_ROW, "title": f"Incident {i}"}
                     for i in range(10)  # API should limit to 10
                 ]
 
@@ -338,15 +330,15 @@ class TestIncidentsFiltering:
                     path='/api/incidents?limit=10'
                 )
 
-                h = handler()
+                h = handler_cls()
                 h.__dict__.update(mock_request.__dict__)
                 h.handle_get()
 
-                response_data = json.loads(mock_request.get_response_body())
+                response_data = mock_request.response_json()
                 assert len(response_data) == 10
 
     @pytest.mark.asyncio
-    async def test_get_incidents_all_filter_value_ignored(self):
+    async def test_get_incidents_all_filter_value_ignored(self, handler_cls):
         """Test that 'all' filter values are treated as no filter"""
         mock_request = MockHTTPRequestHandler(
             path='/api/incidents?country=all&status=all&asset_type=all'
@@ -356,26 +348,22 @@ class TestIncidentsFiltering:
             with patch('incidents.run_async') as mock_run_async:
                 mock_run_async.return_value = [
                     {
-                        "id": str(uuid4()),
+                        **BASE_RESPONSE_ROW,
                         "title": "Mixed country incident",
                         "country": "NO",  # Not filtered out even though we passed country=all
                         "status": "resolved",  # Not filtered out
-                        "evidence_score": 2,
                         "lat": 59.9139,
                         "lon": 10.7522,
                         "asset_type": "harbor",
-                        "narrative": "Test",
-                        "occurred_at": datetime.now(timezone.utc).isoformat(),
-                        "sources": []
                     }
                 ]
 
-                h = handler()
+                h = handler_cls()
                 h.__dict__.update(mock_request.__dict__)
                 h.handle_get()
 
                 assert mock_request.response_code == 200
-                response_data = json.loads(mock_request.get_response_body())
+                response_data = mock_request.response_json()
                 assert len(response_data) == 1
 
 
@@ -383,39 +371,29 @@ class TestIncidentsDataStructure:
     """Test response data structure and PostGIS coordinate extraction"""
 
     @pytest.mark.asyncio
-    async def test_postgis_coordinate_extraction(self):
+    async def test_postgis_coordinate_extraction(self, handler_cls):
         """Test that lat/lon are properly extracted from PostGIS geometry"""
         expected_lat = 55.6181
         expected_lon = 12.6560
 
         with mock_rate_limit_allow():
             with patch('incidents.run_async') as mock_run_async:
-                mock_run_async.return_value = [{
-                    "id": str(uuid4()),
-                    "title": "Test incident",
-                    "lat": expected_lat,
-                    "lon": expected_lon,
-                    "evidence_score": 3,
-                    "country": "DK",
-                    "asset_type": "airport",
-                    "status": "active",
-                    "narrative": "Test",
-                    "occurred_at": datetime.now(timezone.utc).isoformat(),
-                    "sources": []
-                }]
+                mock_run_async.return_value = [
+                    {**BASE_RESPONSE_ROW, "lat": expected_lat, "lon": expected_lon}
+                ]
 
                 mock_request = MockHTTPRequestHandler(path='/api/incidents')
 
-                h = handler()
+                h = handler_cls()
                 h.__dict__.update(mock_request.__dict__)
                 h.handle_get()
 
-                response_data = json.loads(mock_request.get_response_body())
+                response_data = mock_request.response_json()
                 assert response_data[0]["lat"] == expected_lat
                 assert response_data[0]["lon"] == expected_lon
 
     @pytest.mark.asyncio
-    async def test_sources_aggregation(self):
+    async def test_sources_aggregation(self, handler_cls):
         """Test that incidents have sources array with proper structure"""
         mock_sources = [
             {
@@ -435,26 +413,19 @@ class TestIncidentsDataStructure:
         with mock_rate_limit_allow():
             with patch('incidents.run_async') as mock_run_async:
                 mock_run_async.return_value = [{
-                    "id": str(uuid4()),
+                    **BASE_RESPONSE_ROW,
                     "title": "Multi-source incident",
                     "evidence_score": 4,
-                    "country": "DK",
-                    "lat": 55.6181,
-                    "lon": 12.6560,
-                    "asset_type": "airport",
-                    "status": "active",
-                    "narrative": "Test",
-                    "occurred_at": datetime.now(timezone.utc).isoformat(),
                     "sources": mock_sources
                 }]
 
                 mock_request = MockHTTPRequestHandler(path='/api/incidents')
 
-                h = handler()
+                h = handler_cls()
                 h.__dict__.update(mock_request.__dict__)
                 h.handle_get()
 
-                response_data = json.loads(mock_request.get_response_body())
+                response_data = mock_request.response_json()
                 sources = response_data[0]["sources"]
 
                 assert len(sources) == 2
@@ -466,31 +437,31 @@ class TestIncidentsDataStructure:
 class TestIncidentsCORS:
     """Test CORS header handling and security"""
 
-    def test_cors_headers_whitelisted_origin(self):
+    @pytest.mark.parametrize("allowed_origin", [
+        'https://www.dronemap.cc',
+        'https://dronewatch.cc',
+        'http://localhost:3000',
+        'http://localhost:3001'
+    ])
+    def test_cors_headers_whitelisted_origin(self, allowed_origin, handler_cls):
         """Test CORS headers set correctly for whitelisted origins"""
-        for allowed_origin in [
-            'https://www.dronemap.cc',
-            'https://dronewatch.cc',
-            'http://localhost:3000',
-            'http://localhost:3001'
-        ]:
-            with mock_rate_limit_allow():
-                with patch('incidents.run_async') as mock_run_async:
-                    mock_run_async.return_value = []
+        with mock_rate_limit_allow():
+            with patch('incidents.run_async') as mock_run_async:
+                mock_run_async.return_value = []
 
-                    mock_request = MockHTTPRequestHandler(
-                        path='/api/incidents',
-                        origin=allowed_origin
-                    )
+                mock_request = MockHTTPRequestHandler(
+                    path='/api/incidents',
+                    origin=allowed_origin
+                )
 
-                    h = handler()
-                    h.__dict__.update(mock_request.__dict__)
-                    h.handle_get()
+                h = handler_cls()
+                h.__dict__.update(mock_request.__dict__)
+                h.handle_get()
 
-                    assert mock_request.response_headers.get('Access-Control-Allow-Origin') == allowed_origin
-                    assert 'Access-Control-Allow-Methods' in mock_request.response_headers
+                assert mock_request.response_headers.get('Access-Control-Allow-Origin') == allowed_origin
+                assert 'Access-Control-Allow-Methods' in mock_request.response_headers
 
-    def test_cors_headers_blocked_origin(self):
+    def test_cors_headers_blocked_origin(self, handler_cls):
         """Test CORS headers NOT set for non-whitelisted origins"""
         with mock_rate_limit_allow():
             with patch('incidents.run_async') as mock_run_async:
@@ -501,14 +472,14 @@ class TestIncidentsCORS:
                     origin='https://evil-site.com'
                 )
 
-                h = handler()
+                h = handler_cls()
                 h.__dict__.update(mock_request.__dict__)
                 h.handle_get()
 
                 # CORS headers should NOT be present for blocked origins
                 assert 'Access-Control-Allow-Origin' not in mock_request.response_headers
 
-    def test_options_preflight_request(self):
+    def test_options_preflight_request(self, handler_cls):
         """Test OPTIONS preflight request handling"""
         mock_request = MockHTTPRequestHandler(
             path='/api/incidents',
@@ -516,7 +487,7 @@ class TestIncidentsCORS:
             origin='https://www.dronemap.cc'
         )
 
-        h = handler()
+        h = handler_cls()
         h.__dict__.update(mock_request.__dict__)
         h.do_OPTIONS()
 
@@ -529,7 +500,7 @@ class TestIncidentsSearch:
     """Test search query parameter functionality"""
 
     @pytest.mark.asyncio
-    async def test_empty_search_returns_all(self):
+    async def test_empty_search_returns_all(self, handler_cls):
         """Test that empty search parameter returns all incidents (same as no filter)"""
         # Mock incidents - should return all since search is empty
         mock_incidents = [
@@ -574,7 +545,7 @@ class TestIncidentsSearch:
                     "country": inc["country"],
                     "asset_type": inc["asset_type"],
                     "status": inc["status"],
-                    "sources": json.loads(inc["sources"])
+                    "sources": DEFAULT_SOURCES
                 }
                 for inc in mock_incidents
             ]
@@ -585,14 +556,14 @@ class TestIncidentsSearch:
             )
 
             # Execute handler
-            h = object.__new__(handler)
+            h = object.__new__(handler_cls)
             h.path = mock_request.path
             h.command = mock_request.command
             h.headers = mock_request.headers
             h.send_response = mock_request.send_response
             h.send_header = mock_request.send_header
             h.end_headers = mock_request.end_headers
-            h.wfile = mock_request._wfile
+            h.wfile = mock_request.wfile
 
             h.handle_get()
 
@@ -601,7 +572,7 @@ class TestIncidentsSearch:
             assert mock_request.response_headers['Content-Type'] == 'application/json'
 
             # Parse response body
-            response_data = json.loads(mock_request.get_response_body())
+            response_data = mock_request.response_json()
 
             # Should return all 3 incidents since search is empty (no filter applied)
             assert len(response_data) == 3
@@ -613,7 +584,7 @@ class TestIncidentsSearch:
             assert "Oslo military base alert" in titles
 
     @pytest.mark.asyncio
-    async def test_get_incidents_with_search_parameter(self):
+    async def test_get_incidents_with_search_parameter(self, handler_cls):
         """Test search parameter filters incidents by title, narrative, and location_name"""
         # Mock incidents - some matching search term "airport", some not
         mock_matching_incidents = [
@@ -653,7 +624,7 @@ class TestIncidentsSearch:
                     "country": inc["country"],
                     "asset_type": inc["asset_type"],
                     "status": inc["status"],
-                    "sources": json.loads(inc["sources"])
+                    "sources": DEFAULT_SOURCES
                 }
                 for inc in mock_matching_incidents
             ]
@@ -664,7 +635,7 @@ class TestIncidentsSearch:
             )
 
             # Execute handler (use object.__new__ to bypass __init__ requirements)
-            h = object.__new__(handler)
+            h = object.__new__(handler_cls)
             h.path = mock_request.path
             h.command = mock_request.command
             h.headers = mock_request.headers
@@ -675,7 +646,7 @@ class TestIncidentsSearch:
             h.send_response = mock_request.send_response
             h.send_header = mock_request.send_header
             h.end_headers = mock_request.end_headers
-            h.wfile = mock_request._wfile
+            h.wfile = mock_request.wfile
 
             h.handle_get()
 
@@ -684,7 +655,7 @@ class TestIncidentsSearch:
             assert mock_request.response_headers['Content-Type'] == 'application/json'
 
             # Parse response body
-            response_data = json.loads(mock_request.get_response_body())
+            response_data = mock_request.response_json()
             assert len(response_data) == 2
 
             # Verify incidents contain search term in title or narrative
@@ -694,7 +665,7 @@ class TestIncidentsSearch:
                 assert 'airport' in title_lower or 'airport' in narrative_lower
 
     @pytest.mark.asyncio
-    async def test_search_case_insensitive(self):
+    async def test_search_case_insensitive(self, handler_cls):
         """Test that search is case-insensitive - 'Drone', 'drone', 'DRONE' return same results"""
         # Mock incident with mixed case - should match regardless of search case
         mock_incident = create_mock_incident_row(
@@ -727,7 +698,7 @@ class TestIncidentsSearch:
                 "country": mock_incident["country"],
                 "asset_type": mock_incident["asset_type"],
                 "status": mock_incident["status"],
-                "sources": json.loads(mock_incident["sources"])
+                "sources": DEFAULT_SOURCES
             }]
             mock_run_async.return_value = mock_result
 
@@ -735,18 +706,18 @@ class TestIncidentsSearch:
             mock_request_lower = MockHTTPRequestHandler(
                 path='/api/incidents?search=drone'
             )
-            h_lower = object.__new__(handler)
+            h_lower = object.__new__(handler_cls)
             h_lower.path = mock_request_lower.path
             h_lower.command = mock_request_lower.command
             h_lower.headers = mock_request_lower.headers
             h_lower.send_response = mock_request_lower.send_response
             h_lower.send_header = mock_request_lower.send_header
             h_lower.end_headers = mock_request_lower.end_headers
-            h_lower.wfile = mock_request_lower._wfile
+            h_lower.wfile = mock_request_lower.wfile
             h_lower.handle_get()
 
             assert mock_request_lower.response_code == 200
-            response_lower = json.loads(mock_request_lower.get_response_body())
+            response_lower = mock_request_lower.response_json()
             assert len(response_lower) == 1
             assert response_lower[0]['title'] == "Drone spotted over Copenhagen Airport"
 
@@ -757,18 +728,18 @@ class TestIncidentsSearch:
             mock_request_upper = MockHTTPRequestHandler(
                 path='/api/incidents?search=DRONE'
             )
-            h_upper = object.__new__(handler)
+            h_upper = object.__new__(handler_cls)
             h_upper.path = mock_request_upper.path
             h_upper.command = mock_request_upper.command
             h_upper.headers = mock_request_upper.headers
             h_upper.send_response = mock_request_upper.send_response
             h_upper.send_header = mock_request_upper.send_header
             h_upper.end_headers = mock_request_upper.end_headers
-            h_upper.wfile = mock_request_upper._wfile
+            h_upper.wfile = mock_request_upper.wfile
             h_upper.handle_get()
 
             assert mock_request_upper.response_code == 200
-            response_upper = json.loads(mock_request_upper.get_response_body())
+            response_upper = mock_request_upper.response_json()
             assert len(response_upper) == 1
             assert response_upper[0]['title'] == "Drone spotted over Copenhagen Airport"
 
@@ -779,18 +750,18 @@ class TestIncidentsSearch:
             mock_request_mixed = MockHTTPRequestHandler(
                 path='/api/incidents?search=DroNe'
             )
-            h_mixed = object.__new__(handler)
+            h_mixed = object.__new__(handler_cls)
             h_mixed.path = mock_request_mixed.path
             h_mixed.command = mock_request_mixed.command
             h_mixed.headers = mock_request_mixed.headers
             h_mixed.send_response = mock_request_mixed.send_response
             h_mixed.send_header = mock_request_mixed.send_header
             h_mixed.end_headers = mock_request_mixed.end_headers
-            h_mixed.wfile = mock_request_mixed._wfile
+            h_mixed.wfile = mock_request_mixed.wfile
             h_mixed.handle_get()
 
             assert mock_request_mixed.response_code == 200
-            response_mixed = json.loads(mock_request_mixed.get_response_body())
+            response_mixed = mock_request_mixed.response_json()
             assert len(response_mixed) == 1
             assert response_mixed[0]['title'] == "Drone spotted over Copenhagen Airport"
 
@@ -798,7 +769,7 @@ class TestIncidentsSearch:
             assert response_lower == response_upper == response_mixed
 
     @pytest.mark.asyncio
-    async def test_search_multiple_fields(self):
+    async def test_search_multiple_fields(self, handler_cls):
         """Test that search matches across title, narrative, and location_name fields"""
         # Create mock incidents with search term "Copenhagen" in different fields:
         # 1. Title contains "Copenhagen"
@@ -869,14 +840,14 @@ class TestIncidentsSearch:
             )
 
             # Execute handler
-            h = object.__new__(handler)
+            h = object.__new__(handler_cls)
             h.path = mock_request.path
             h.command = mock_request.command
             h.headers = mock_request.headers
             h.send_response = mock_request.send_response
             h.send_header = mock_request.send_header
             h.end_headers = mock_request.end_headers
-            h.wfile = mock_request._wfile
+            h.wfile = mock_request.wfile
 
             h.handle_get()
 
@@ -885,7 +856,7 @@ class TestIncidentsSearch:
             assert mock_request.response_headers['Content-Type'] == 'application/json'
 
             # Parse response body
-            response_data = json.loads(mock_request.get_response_body())
+            response_data = mock_request.response_json()
 
             # Should return all 3 incidents (matched in different fields)
             assert len(response_data) == 3
@@ -910,7 +881,7 @@ class TestIncidentsSearch:
             assert "Military facility incident" in titles  # Match in location_name
 
     @pytest.mark.asyncio
-    async def test_search_special_characters(self):
+    async def test_search_special_characters(self, handler_cls):
         """Test that search with special characters (%, _, ', ") is safely handled"""
         # Test various special characters that could cause SQL injection or query issues
         special_char_queries = [
@@ -952,14 +923,14 @@ class TestIncidentsSearch:
                 )
 
                 # Execute handler
-                h = object.__new__(handler)
+                h = object.__new__(handler_cls)
                 h.path = mock_request.path
                 h.command = mock_request.command
                 h.headers = mock_request.headers
                 h.send_response = mock_request.send_response
                 h.send_header = mock_request.send_header
                 h.end_headers = mock_request.end_headers
-                h.wfile = mock_request._wfile
+                h.wfile = mock_request.wfile
 
                 # Handler should not crash with special characters
                 try:
@@ -974,12 +945,12 @@ class TestIncidentsSearch:
                     f"Expected JSON content type for query '{special_query}'"
 
                 # Verify response body is valid JSON array
-                response_data = json.loads(mock_request.get_response_body())
+                response_data = mock_request.response_json()
                 assert isinstance(response_data, list), \
                     f"Expected list response for query '{special_query}'"
 
     @pytest.mark.asyncio
-    async def test_search_with_country_filter(self):
+    async def test_search_with_country_filter(self, handler_cls):
         """Test that search works correctly when combined with country filter"""
         # Create mock incidents that match both search="drone" and country="DK"
         # These simulate what the database would return when both filters are applied
@@ -1032,14 +1003,14 @@ class TestIncidentsSearch:
             )
 
             # Execute handler
-            h = object.__new__(handler)
+            h = object.__new__(handler_cls)
             h.path = mock_request.path
             h.command = mock_request.command
             h.headers = mock_request.headers
             h.send_response = mock_request.send_response
             h.send_header = mock_request.send_header
             h.end_headers = mock_request.end_headers
-            h.wfile = mock_request._wfile
+            h.wfile = mock_request.wfile
 
             h.handle_get()
 
@@ -1048,7 +1019,7 @@ class TestIncidentsSearch:
             assert mock_request.response_headers['Content-Type'] == 'application/json'
 
             # Parse response body
-            response_data = json.loads(mock_request.get_response_body())
+            response_data = mock_request.response_json()
 
             # Should return 2 incidents (matching both search="drone" and country="DK")
             assert len(response_data) == 2
@@ -1070,7 +1041,7 @@ class TestIncidentsErrorHandling:
     """Test error handling and edge cases"""
 
     @pytest.mark.asyncio
-    async def test_database_error_returns_500(self):
+    async def test_database_error_returns_500(self, handler_cls):
         """Test database errors return 500 status"""
         with mock_rate_limit_allow():
             with patch('incidents.run_async') as mock_run_async:
@@ -1079,16 +1050,16 @@ class TestIncidentsErrorHandling:
 
                 mock_request = MockHTTPRequestHandler(path='/api/incidents')
 
-                h = handler()
+                h = handler_cls()
                 h.__dict__.update(mock_request.__dict__)
                 h.handle_get()
 
                 assert mock_request.response_code == 500
-                response_data = json.loads(mock_request.get_response_body())
+                response_data = mock_request.response_json()
                 assert response_data == []
 
     @pytest.mark.asyncio
-    async def test_invalid_parameters_handled_gracefully(self):
+    async def test_invalid_parameters_handled_gracefully(self, handler_cls):
         """Test invalid query parameters don't crash the API"""
         with mock_rate_limit_allow():
             with patch('incidents.run_async') as mock_run_async:
@@ -1099,7 +1070,7 @@ class TestIncidentsErrorHandling:
                     path='/api/incidents?min_evidence=invalid'
                 )
 
-                h = handler()
+                h = handler_cls()
                 h.__dict__.update(mock_request.__dict__)
 
                 try:
@@ -1111,7 +1082,7 @@ class TestIncidentsErrorHandling:
                     pass
 
     @pytest.mark.asyncio
-    async def test_cache_control_header_set(self):
+    async def test_cache_control_header_set(self, handler_cls):
         """Test Cache-Control header is set for performance"""
         with mock_rate_limit_allow():
             with patch('incidents.run_async') as mock_run_async:
@@ -1119,7 +1090,7 @@ class TestIncidentsErrorHandling:
 
                 mock_request = MockHTTPRequestHandler(path='/api/incidents')
 
-                h = handler()
+                h = handler_cls()
                 h.__dict__.update(mock_request.__dict__)
                 h.handle_get()
 
@@ -1132,7 +1103,7 @@ class TestIncidentsErrorHandling:
 class TestIncidentsRateLimiting:
     """Test rate limiting behavior with the distributed rate limiter"""
 
-    def test_rate_limit_exceeded_returns_429(self):
+    def test_rate_limit_exceeded_returns_429(self, handler_cls):
         """Test that exceeding rate limit returns 429 status"""
         with mock_rate_limit_block(remaining=0, reset_after=30):
             mock_request = MockHTTPRequestHandler(
@@ -1140,17 +1111,17 @@ class TestIncidentsRateLimiting:
                 origin='https://www.dronemap.cc'
             )
 
-            h = handler()
+            h = handler_cls()
             h.__dict__.update(mock_request.__dict__)
             h.handle_get()
 
             assert mock_request.response_code == 429
-            response_data = json.loads(mock_request.get_response_body())
+            response_data = mock_request.response_json()
             assert 'error' in response_data
             assert response_data['error'] == 'Rate limit exceeded'
             assert 'retry_after' in response_data
 
-    def test_rate_limit_headers_included_on_429(self):
+    def test_rate_limit_headers_included_on_429(self, handler_cls):
         """Test that rate limit headers are included in 429 response"""
         with mock_rate_limit_block(remaining=0, reset_after=30):
             mock_request = MockHTTPRequestHandler(
@@ -1158,7 +1129,7 @@ class TestIncidentsRateLimiting:
                 origin='https://www.dronemap.cc'
             )
 
-            h = handler()
+            h = handler_cls()
             h.__dict__.update(mock_request.__dict__)
             h.handle_get()
 
@@ -1167,7 +1138,7 @@ class TestIncidentsRateLimiting:
             assert 'X-RateLimit-Remaining' in mock_request.response_headers
             assert 'Retry-After' in mock_request.response_headers
 
-    def test_rate_limit_headers_included_on_success(self):
+    def test_rate_limit_headers_included_on_success(self, handler_cls):
         """Test that rate limit headers are included in successful responses"""
         with mock_rate_limit_allow():
             with patch('incidents.run_async') as mock_run_async:
@@ -1175,7 +1146,7 @@ class TestIncidentsRateLimiting:
 
                 mock_request = MockHTTPRequestHandler(path='/api/incidents')
 
-                h = handler()
+                h = handler_cls()
                 h.__dict__.update(mock_request.__dict__)
                 h.handle_get()
 
@@ -1183,7 +1154,7 @@ class TestIncidentsRateLimiting:
                 assert 'X-RateLimit-Limit' in mock_request.response_headers
                 assert 'X-RateLimit-Remaining' in mock_request.response_headers
 
-    def test_cors_headers_on_rate_limit_response(self):
+    def test_cors_headers_on_rate_limit_response(self, handler_cls):
         """Test that CORS headers are still included on rate limit response for allowed origins"""
         with mock_rate_limit_block(remaining=0, reset_after=30):
             mock_request = MockHTTPRequestHandler(
@@ -1191,7 +1162,7 @@ class TestIncidentsRateLimiting:
                 origin='https://www.dronemap.cc'
             )
 
-            h = handler()
+            h = handler_cls()
             h.__dict__.update(mock_request.__dict__)
             h.handle_get()
 
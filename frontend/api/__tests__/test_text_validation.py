@@ -3,11 +3,6 @@ Comprehensive unit tests for text_validation.py module.
 Tests all validation and sanitization functions for incident title and narrative fields.
 """
 import pytest
-import sys
-import os
-
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from text_validation import (
     validate_text_length,
@@ -21,8 +16,17 @@ from text_validation import (
     validate_narrative,
     MAX_TITLE_LENGTH,
     MAX_NARRATIVE_LENGTH,
+    SANITIZE_CACHE_MAX_INPUT,
+    validation_cache_stats,
 )
 
+# Boundary-length inputs, built once at import rather than in each test
+TITLE_AT_LIMIT = "A" * 500
+TITLE_OVER_LIMIT = "A" * 501
+NARRATIVE_AT_LIMIT = "A" * 10000
+NARRATIVE_OVER_LIMIT = "A" * 10001
+LONG_ATTRIBUTE_VALUE = "x" * 10000
+
 
 class TestValidateTextLength:
     """Tests for validate_text_length() function"""
@@ -82,68 +86,37 @@ class TestValidateTextLength:
         assert is_valid is True
 
 
+# (text, expected) pairs for strip_html_tags(): tag, comment and CDATA removal
+# followed by entity decoding
+STRIP_HTML_CASES = [
+    pytest.param("<p>Hello <b>World</b></p>", "Hello World", id="simple_tags"),
+    pytest.param("Line 1<br/>Line 2<hr/>", "Line 1Line 2", id="self_closing_tags"),
+    pytest.param('<a href="https://example.com">Link</a>', "Link", id="tags_with_attributes"),
+    pytest.param("Before<!-- comment -->After", "BeforeAfter", id="html_comments"),
+    pytest.param("Before<!--\nmultiline\ncomment\n-->After", "BeforeAfter", id="multiline_comments"),
+    pytest.param("Before<![CDATA[some data]]>After", "BeforeAfter", id="cdata_sections"),
+    pytest.param("<div><p><span>Content</span></p></div>", "Content", id="nested_tags"),
+    pytest.param("<div>Before<p unclosed>Middle</div>After", "BeforeMiddleAfter", id="malformed_tags"),
+    pytest.param("&lt;script&gt;alert('xss')&lt;/script&gt;", "<script>alert('xss')</script>",
+                 id="decode_named_entities"),
+    pytest.param("A &amp; B", "A & B", id="decode_ampersand"),
+    pytest.param("&#60;Hello&#62;", "<Hello>", id="decode_numeric_entities"),
+    pytest.param("&#x3C;Hello&#x3E;", "<Hello>", id="decode_hex_entities"),
+    # HTML5 numeric references: C1 code points map through Windows-1252 and
+    # invalid ones become U+FFFD, so a plain chr(int(...)) decoder is wrong
+    pytest.param("&#128;5 &#x99; &#0;", "\u20ac5 \u2122 \ufffd", id="decode_html5_numeric_remapping"),
+    # An entity split by a tag is decoded once the tag is stripped
+    pytest.param("A &<b></b>amp; B", "A & B", id="entity_revealed_by_tag_removal"),
+]
+
+
 class TestStripHtmlTags:
     """Tests for strip_html_tags() function"""
 
-    def test_strip_simple_html_tags(self):
-        """Test stripping simple HTML tags"""
-        text = "<p>Hello <b>World</b></p>"
-        result = strip_html_tags(text)
-        assert result == "Hello World"
-
-    def test_strip_self_closing_tags(self):
-        """Test stripping self-closing tags"""
-        text = "Line 1<br/>Line 2<hr/>"
-        result = strip_html_tags(text)
-        assert result == "Line 1Line 2"
-
-    def test_strip_tags_with_attributes(self):
-        """Test stripping tags with attributes"""
-        text = '<a href="https://example.com">Link</a>'
-        result = strip_html_tags(text)
-        assert result == "Link"
-
-    def test_strip_html_comments(self):
-        """Test stripping HTML comments"""
-        text = "Before<!-- comment -->After"
-        result = strip_html_tags(text)
-        assert result == "BeforeAfter"
-
-    def test_strip_multiline_comments(self):
-        """Test stripping multiline HTML comments"""
-        text = "Before<!--\nmultiline\ncomment\n-->After"
-        result = strip_html_tags(text)
-        assert result == "BeforeAfter"
-
-    def test_strip_cdata_sections(self):
-        """Test stripping CDATA sections"""
-        text = "Before<![CDATA[some data]]>After"
-        result = strip_html_tags(text)
-        assert result == "BeforeAfter"
-
-    def test_decode_html_entities(self):
-        """Test decoding HTML entities"""
-        text = "&lt;script&gt;alert('xss')&lt;/script&gt;"
-        result = strip_html_tags(text)
-        assert result == "<script>alert('xss')</script>"
-
-    def test_decode_ampersand(self):
-        """Test decoding ampersand entity"""
-        text = "A &amp; B"
-        result = strip_html_tags(text)
-        assert result == "A & B"
-
-    def test_decode_numeric_entities(self):
-        """Test decoding numeric HTML entities"""
-        text = "&#60;Hello&#62;"  # <Hello>
-        result = strip_html_tags(text)
-        assert result == "<Hello>"
-
-    def test_decode_hex_entities(self):
-        """Test decoding hexadecimal HTML entities"""
-        text = "&#x3C;Hello&#x3E;"  # <Hello>
-        result = strip_html_tags(text)
-        assert result == "<Hello>"
+    @pytest.mark.parametrize("text,expected", STRIP_HTML_CASES)
+    def test_strip_and_decode(self, text, expected):
+        """Test markup is removed and entities decoded"""
+        assert strip_html_tags(text) == expected
 
     def test_empty_string(self):
         """Test empty string returns empty"""
@@ -153,17 +126,10 @@ class TestStripHtmlTags:
         """Test None returns None"""
         assert strip_html_tags(None) is None
 
-    def test_nested_tags(self):
-        """Test stripping nested tags"""
-        text = "<div><p><span>Content</span></p></div>"
-        result = strip_html_tags(text)
-        assert result == "Content"
-
-    def test_malformed_tags_removed(self):
-        """Test malformed tags are still removed"""
-        text = "<div>Before<p unclosed>Middle</div>After"
-        result = strip_html_tags(text)
-        assert result == "BeforeMiddleAfter"
+    def test_plain_text_returned_unchanged(self):
+        """Test text without '<' or '&' skips stripping and decoding"""
+        text = "Drone spotted near København Airport at 15:30"
+        assert strip_html_tags(text) is text
 
 
 class TestRemoveControlCharacters:
@@ -308,6 +274,18 @@ class TestNormalizeWhitespace:
         result = normalize_whitespace(text)
         assert result == "Hello World"
 
+    def test_collapse_mixed_whitespace_single_line(self):
+        """Test CR, form feed and unicode spaces collapse on a single line"""
+        text = " Hello\r\x0c\u00a0\u2003World\t"
+        result = normalize_whitespace(text)
+        assert result == "Hello World"
+
+    def test_collapse_mixed_whitespace_multi_line(self):
+        """Test unicode spaces collapse but lone spaces and newlines survive"""
+        text = "Hello \u3000 World\x85\nNext line\u2028here"
+        result = normalize_whitespace(text)
+        assert result == "Hello World \nNext line here"
+
     def test_empty_string(self):
         """Test empty string returns empty"""
         assert normalize_whitespace("") == ""
@@ -386,240 +364,111 @@ class TestSanitizeText:
         result = sanitize_text(text)
         assert result == "Less < Greater > Amp &"
 
+    def test_input_over_cache_limit_sanitized(self):
+        """Test inputs too long for the result cache get the same pipeline"""
+        count = SANITIZE_CACHE_MAX_INPUT // 8
+        text = "<b>x</b>  " * count
+        assert len(text) >= SANITIZE_CACHE_MAX_INPUT
+        result = sanitize_text(text)
+        assert result == " ".join(["x"] * count)
+
+
+def assert_xss_detected(payload, *fragments):
+    """Assert detect_xss_patterns rejects payload, naming one of fragments if given"""
+    is_safe, msg = detect_xss_patterns(payload)
+    assert is_safe is False, f"XSS not detected: {payload!r}"
+    if fragments:
+        assert any(fragment in msg.lower() for fragment in fragments), msg
+
+
+def assert_xss_safe(text):
+    """Assert detect_xss_patterns accepts text without a warning"""
+    is_safe, msg = detect_xss_patterns(text)
+    assert is_safe is True, msg
+    assert msg is None
+
+
+# (payload, fragments): detect_xss_patterns must reject the payload and, when
+# fragments are given, its message must mention at least one of them. Several
+# payloads trip more than one rule, and whichever fires first is a valid hit.
+XSS_DETECTION_CASES = [
+    # Basic script tags
+    pytest.param("<script>alert('xss')</script>", ("script",), id="script_tag"),
+    pytest.param("<SCRIPT>alert('xss')</SCRIPT>", ("script",), id="script_tag_uppercase"),
+    pytest.param("< script>alert('xss')</script>", (), id="script_tag_with_space"),
+    pytest.param("<script src='evil.js'/>", (), id="script_tag_self_closing"),
+    # Event handlers
+    pytest.param("<img onclick='alert(1)'/>", ("img", "onclick"), id="onclick_handler"),
+    pytest.param("<img src=x onerror='alert(1)'/>", ("img", "onerror"), id="onerror_handler"),
+    pytest.param("<body onload='alert(1)'>", ("body", "onload"), id="onload_handler"),
+    pytest.param("<div onmouseover='alert(1)'>", ("onmouseover",), id="onmouseover_handler"),
+    pytest.param("<input onfocus='alert(1)'>", ("input", "onfocus"), id="onfocus_handler"),
+    # Dangerous URI schemes
+    pytest.param("<a href='javascript:alert(1)'>", ("javascript",), id="javascript_uri"),
+    pytest.param("<a href='vbscript:msgbox(1)'>", ("vbscript",), id="vbscript_uri"),
+    pytest.param("<a href='data:text/html,<script>alert(1)</script>'>", (), id="data_uri_html"),
+    pytest.param("<a href='data:text/html;base64,PHNjcmlwdD5hbGVydCgxKTwvc2NyaXB0Pg=='>", (),
+                 id="data_uri_base64"),
+    # Dangerous tags
+    pytest.param("<iframe src='evil.com'>", ("iframe",), id="iframe_tag"),
+    pytest.param("<object data='evil.swf'>", ("object",), id="object_tag"),
+    pytest.param("<embed src='evil.swf'>", ("embed",), id="embed_tag"),
+    pytest.param("<svg onload='alert(1)'>", (), id="svg_tag"),
+    pytest.param("<img src=x onerror=alert(1)>", (), id="img_tag"),
+    pytest.param("<form action='evil.com'>", (), id="form_tag"),
+    # Encoded attacks (%253C = double encoded <)
+    pytest.param("%3Cscript%3Ealert(1)%3C/script%3E", (), id="url_encoded_script"),
+    pytest.param("%253Cscript%253Ealert(1)%253C/script%253E", (), id="double_url_encoded"),
+    pytest.param("&#60;script&#62;alert(1)&#60;/script&#62;", (), id="html_entity_encoded"),
+    pytest.param("&#x3C;script&#x3E;alert(1)&#x3C;/script&#x3E;", (), id="hex_entity_encoded"),
+    # CSS expressions
+    pytest.param("<div style='width: expression(alert(1))'>", ("css",), id="css_expression"),
+    pytest.param("<div style='background: url(javascript:alert(1))'>", (), id="css_url_javascript"),
+    # Long s (U+017F) matches "s" case-insensitively
+    pytest.param("<div style='width: expre\u017f\u017fion(alert(1))'>", ("css",), id="css_expression_long_s"),
+    # SVG/MathML
+    pytest.param("<svg><script>alert(1)</script></svg>", (), id="svg_with_script"),
+    pytest.param("<math onclick='alert(1)'>", (), id="mathml_with_event"),
+    # DOM clobbering
+    pytest.param("<form id='location'>", ("form", "dom clobbering"), id="dom_clobbering_form"),
+    pytest.param("<input name='document'>", (), id="dom_clobbering_input"),
+    # Other injection vectors
+    pytest.param("<!--<script>alert(1)</script>-->", (), id="script_in_comment"),
+    pytest.param("<meta http-equiv='refresh' content='0;url=evil.com'>", (), id="meta_refresh"),
+    pytest.param("<iframe srcdoc='<script>alert(1)</script>'>", (), id="srcdoc_attribute"),
+    pytest.param("<button formaction='javascript:alert(1)'>", (), id="formaction"),
+    pytest.param("<svg><a xlink:href='javascript:alert(1)'>", (), id="xlink_href"),
+]
+
+XSS_SAFE_CASES = [
+    pytest.param("A drone was spotted near the airport", id="plain_text"),
+    pytest.param("Incident occurred at 14:30, 2 drones spotted", id="text_with_numbers"),
+    pytest.param("Location: 55.68°N, 12.58°E", id="text_with_special_chars"),
+    pytest.param("", id="empty_string"),
+    pytest.param(None, id="none_value"),
+]
+
 
 class TestDetectXssPatterns:
     """Tests for detect_xss_patterns() function"""
 
-    # Basic Script Tag Tests
-    def test_detect_script_tag(self):
-        """Test detection of basic script tag"""
-        is_safe, msg = detect_xss_patterns("<script>alert('xss')</script>")
-        assert is_safe is False
-        assert "script" in msg.lower()
-
-    def test_detect_script_tag_uppercase(self):
-        """Test detection of uppercase script tag"""
-        is_safe, msg = detect_xss_patterns("<SCRIPT>alert('xss')</SCRIPT>")
-        assert is_safe is False
-        assert "script" in msg.lower()
-
-    def test_detect_script_tag_with_space(self):
-        """Test detection of script tag with space after <"""
-        is_safe, msg = detect_xss_patterns("< script>alert('xss')</script>")
-        assert is_safe is False
-
-    def test_detect_script_tag_self_closing(self):
-        """Test detection of self-closing script tag"""
-        is_safe, msg = detect_xss_patterns("<script src='evil.js'/>")
-        assert is_safe is False
-
-    # Event Handler Tests
-    def test_detect_onclick_handler(self):
-        """Test detection of onclick event handler"""
-        is_safe, msg = detect_xss_patterns("<img onclick='alert(1)'/>")
-        assert is_safe is False
-        # May detect img tag or onclick - both are valid detections
-        assert "img" in msg.lower() or "onclick" in msg.lower()
-
-    def test_detect_onerror_handler(self):
-        """Test detection of onerror event handler"""
-        is_safe, msg = detect_xss_patterns("<img src=x onerror='alert(1)'/>")
-        assert is_safe is False
-        # May detect img tag or onerror - both are valid detections
-        assert "img" in msg.lower() or "onerror" in msg.lower()
-
-    def test_detect_onload_handler(self):
-        """Test detection of onload event handler"""
-        is_safe, msg = detect_xss_patterns("<body onload='alert(1)'>")
-        assert is_safe is False
-        # May detect body tag or onload - both are valid detections
-        assert "body" in msg.lower() or "onload" in msg.lower()
-
-    def test_detect_onmouseover_handler(self):
-        """Test detection of onmouseover event handler"""
-        is_safe, msg = detect_xss_patterns("<div onmouseover='alert(1)'>")
-        assert is_safe is False
-        assert "onmouseover" in msg.lower()
-
-    def test_detect_onfocus_handler(self):
-        """Test detection of onfocus event handler"""
-        is_safe, msg = detect_xss_patterns("<input onfocus='alert(1)'>")
-        assert is_safe is False
-        # May detect input tag or onfocus - both are valid detections
-        assert "input" in msg.lower() or "onfocus" in msg.lower()
-
-    # Dangerous URI Schemes
-    def test_detect_javascript_uri(self):
-        """Test detection of javascript: URI"""
-        is_safe, msg = detect_xss_patterns("<a href='javascript:alert(1)'>")
-        assert is_safe is False
-        assert "javascript" in msg.lower()
-
-    def test_detect_vbscript_uri(self):
-        """Test detection of vbscript: URI"""
-        is_safe, msg = detect_xss_patterns("<a href='vbscript:msgbox(1)'>")
-        assert is_safe is False
-        assert "vbscript" in msg.lower()
-
-    def test_detect_data_uri_html(self):
-        """Test detection of data: URI with HTML"""
-        is_safe, msg = detect_xss_patterns("<a href='data:text/html,<script>alert(1)</script>'>")
-        assert is_safe is False
-
-    def test_detect_data_uri_base64(self):
-        """Test detection of data: URI with base64"""
-        is_safe, msg = detect_xss_patterns("<a href='data:text/html;base64,PHNjcmlwdD5hbGVydCgxKTwvc2NyaXB0Pg=='>")
-        assert is_safe is False
-
-    # Dangerous Tags
-    def test_detect_iframe_tag(self):
-        """Test detection of iframe tag"""
-        is_safe, msg = detect_xss_patterns("<iframe src='evil.com'>")
-        assert is_safe is False
-        assert "iframe" in msg.lower()
-
-    def test_detect_object_tag(self):
-        """Test detection of object tag"""
-        is_safe, msg = detect_xss_patterns("<object data='evil.swf'>")
-        assert is_safe is False
-        assert "object" in msg.lower()
-
-    def test_detect_embed_tag(self):
-        """Test detection of embed tag"""
-        is_safe, msg = detect_xss_patterns("<embed src='evil.swf'>")
-        assert is_safe is False
-        assert "embed" in msg.lower()
-
-    def test_detect_svg_tag(self):
-        """Test detection of SVG tag"""
-        is_safe, msg = detect_xss_patterns("<svg onload='alert(1)'>")
-        assert is_safe is False
-
-    def test_detect_img_tag(self):
-        """Test detection of img tag (can be vector)"""
-        is_safe, msg = detect_xss_patterns("<img src=x onerror=alert(1)>")
-        assert is_safe is False
-
-    def test_detect_form_tag(self):
-        """Test detection of form tag"""
-        is_safe, msg = detect_xss_patterns("<form action='evil.com'>")
-        assert is_safe is False
-
-    # Safe Content
-    def test_safe_plain_text(self):
-        """Test safe plain text passes"""
-        is_safe, msg = detect_xss_patterns("A drone was spotted near the airport")
-        assert is_safe is True
-        assert msg is None
-
-    def test_safe_text_with_numbers(self):
-        """Test safe text with numbers"""
-        is_safe, msg = detect_xss_patterns("Incident occurred at 14:30, 2 drones spotted")
-        assert is_safe is True
-
-    def test_safe_text_with_special_chars(self):
-        """Test safe text with special characters"""
-        is_safe, msg = detect_xss_patterns("Location: 55.68°N, 12.58°E")
-        assert is_safe is True
-
-    def test_safe_empty_string(self):
-        """Test empty string is safe"""
-        is_safe, msg = detect_xss_patterns("")
-        assert is_safe is True
-
-    def test_safe_none_value(self):
-        """Test None is safe"""
-        is_safe, msg = detect_xss_patterns(None)
-        assert is_safe is True
-
-    # Encoded Attack Detection
-    def test_detect_url_encoded_script(self):
-        """Test detection of URL-encoded script tag"""
-        is_safe, msg = detect_xss_patterns("%3Cscript%3Ealert(1)%3C/script%3E")
-        assert is_safe is False
-
-    def test_detect_double_url_encoded(self):
-        """Test detection of double URL-encoded payload"""
-        # %253C = double encoded <
-        is_safe, msg = detect_xss_patterns("%253Cscript%253Ealert(1)%253C/script%253E")
-        assert is_safe is False
-
-    def test_detect_html_entity_encoded(self):
-        """Test detection of HTML entity encoded script"""
-        is_safe, msg = detect_xss_patterns("&#60;script&#62;alert(1)&#60;/script&#62;")
-        assert is_safe is False
-
-    def test_detect_hex_entity_encoded(self):
-        """Test detection of hex entity encoded script"""
-        is_safe, msg = detect_xss_patterns("&#x3C;script&#x3E;alert(1)&#x3C;/script&#x3E;")
-        assert is_safe is False
-
-    # CSS Expression Attacks
-    def test_detect_css_expression(self):
-        """Test detection of CSS expression"""
-        is_safe, msg = detect_xss_patterns("<div style='width: expression(alert(1))'>")
-        assert is_safe is False
-        assert "CSS" in msg
-
-    def test_detect_css_url_javascript(self):
-        """Test detection of CSS url() with javascript"""
-        is_safe, msg = detect_xss_patterns("<div style='background: url(javascript:alert(1))'>")
-        assert is_safe is False
-
-    # SVG/MathML Attacks
-    def test_detect_svg_onload(self):
-        """Test detection of SVG onload attack"""
-        is_safe, msg = detect_xss_patterns("<svg onload='alert(1)'>")
-        assert is_safe is False
-
-    def test_detect_svg_with_script(self):
-        """Test detection of SVG containing script"""
-        is_safe, msg = detect_xss_patterns("<svg><script>alert(1)</script></svg>")
-        assert is_safe is False
-
-    def test_detect_mathml_with_event(self):
-        """Test detection of MathML with event handler"""
-        is_safe, msg = detect_xss_patterns("<math onclick='alert(1)'>")
-        assert is_safe is False
-
-    # DOM Clobbering
-    def test_detect_dom_clobbering_form(self):
-        """Test detection of DOM clobbering with form"""
-        is_safe, msg = detect_xss_patterns("<form id='location'>")
-        assert is_safe is False
-        # May detect form tag or DOM clobbering - both are valid detections
-        assert "form" in msg.lower() or "DOM clobbering" in msg
-
-    def test_detect_dom_clobbering_input(self):
-        """Test detection of DOM clobbering with input"""
-        is_safe, msg = detect_xss_patterns("<input name='document'>")
-        assert is_safe is False
-
-    # Other Injection Vectors
-    def test_detect_script_in_comment(self):
-        """Test detection of script hidden in comment"""
-        is_safe, msg = detect_xss_patterns("<!--<script>alert(1)</script>-->")
-        assert is_safe is False
-
-    def test_detect_meta_refresh(self):
-        """Test detection of meta refresh injection"""
-        is_safe, msg = detect_xss_patterns("<meta http-equiv='refresh' content='0;url=evil.com'>")
-        assert is_safe is False
-
-    def test_detect_srcdoc_attribute(self):
-        """Test detection of srcdoc attribute"""
-        is_safe, msg = detect_xss_patterns("<iframe srcdoc='<script>alert(1)</script>'>")
-        assert is_safe is False
-
-    def test_detect_formaction(self):
-        """Test detection of formaction attribute"""
-        is_safe, msg = detect_xss_patterns("<button formaction='javascript:alert(1)'>")
-        assert is_safe is False
-
-    def test_detect_xlink_href(self):
-        """Test detection of xlink:href attribute"""
-        is_safe, msg = detect_xss_patterns("<svg><a xlink:href='javascript:alert(1)'>")
-        assert is_safe is False
+    @pytest.mark.parametrize("payload,fragments", XSS_DETECTION_CASES)
+    def test_detects_xss(self, payload, fragments):
+        """Test known XSS vectors are rejected with a matching message"""
+        assert_xss_detected(payload, *fragments)
+
+    @pytest.mark.parametrize("text", XSS_SAFE_CASES)
+    def test_safe_text_passes(self, text):
+        """Test benign text passes without a message"""
+        assert_xss_safe(text)
+
+    def test_repeated_payload_served_from_cache(self):
+        """Test scanning the same markup twice hits the detection cache"""
+        payload = "<img src=x onerror=alert('cache check')>"
+        first = detect_xss_patterns(payload)
+        hits = validation_cache_stats()["detect_xss_patterns"].hits
+        assert detect_xss_patterns(payload) is first
+        assert validation_cache_stats()["detect_xss_patterns"].hits == hits + 1
 
 
 class TestValidateTitle:
@@ -655,19 +504,38 @@ class TestValidateTitle:
 
     def test_title_exceeds_max_length(self):
         """Test title exceeding 500 chars is invalid"""
-        long_title = "A" * 501
-        is_valid, sanitized, error = validate_title(long_title)
+        is_valid, sanitized, error = validate_title(TITLE_OVER_LIMIT)
         assert is_valid is False
         assert "exceeds maximum length" in error
         assert "500" in error
 
     def test_title_exactly_max_length(self):
         """Test title exactly at 500 chars is valid"""
-        title = "A" * 500
-        is_valid, sanitized, error = validate_title(title)
+        is_valid, sanitized, error = validate_title(TITLE_AT_LIMIT)
         assert is_valid is True
         assert len(sanitized) == 500
 
+    def test_title_far_over_limit_rejected_unsanitized(self):
+        """Test title over twice the limit is rejected before sanitization"""
+        is_valid, sanitized, error = validate_title("<b>A</b>" * 200)
+        assert is_valid is False
+        assert sanitized == ""
+        assert "exceeds maximum length (1600 > 500" in error
+
+    def test_repeated_title_served_from_cache(self):
+        """Test validating the same title twice hits the validation cache"""
+        title = "Cache check: drone over Aalborg harbour"
+        first = validate_title(title)
+        hits = validation_cache_stats()["validate_title"].hits
+        assert validate_title(title) is first
+        assert validation_cache_stats()["validate_title"].hits == hits + 1
+
+    def test_title_markup_within_raw_limit_sanitized_to_fit(self):
+        """Test title over the limit only before HTML stripping is valid"""
+        is_valid, sanitized, error = validate_title("<b>A</b>" * 100)
+        assert is_valid is True
+        assert sanitized == "A" * 100
+
     def test_title_sanitized_html(self):
         """Test title with HTML is sanitized"""
         is_valid, sanitized, error = validate_title("<b>Important</b> drone sighting")
@@ -735,16 +603,14 @@ class TestValidateNarrative:
 
     def test_narrative_exceeds_max_length(self):
         """Test narrative exceeding 10000 chars is invalid"""
-        long_narrative = "A" * 10001
-        is_valid, sanitized, error = validate_narrative(long_narrative)
+        is_valid, sanitized, error = validate_narrative(NARRATIVE_OVER_LIMIT)
         assert is_valid is False
         assert "exceeds maximum length" in error
         assert "10000" in error
 
     def test_narrative_exactly_max_length(self):
         """Test narrative exactly at 10000 chars is valid"""
-        narrative = "A" * 10000
-        is_valid, sanitized, error = validate_narrative(narrative)
+        is_valid, sanitized, error = validate_narrative(NARRATIVE_AT_LIMIT)
         assert is_valid is True
         assert len(sanitized) == 10000
 
@@ -826,582 +692,190 @@ class TestEdgeCases:
 
     def test_mixed_case_event_handlers(self):
         """Test mixed case event handlers"""
-        is_safe, msg = detect_xss_patterns("<img OnErRoR='alert(1)'>")
-        assert is_safe is False
+        assert_xss_detected("<img OnErRoR='alert(1)'>")
 
     def test_newline_in_tag(self):
         """Test newline within tag"""
-        is_safe, msg = detect_xss_patterns("<script\n>alert(1)</script>")
-        assert is_safe is False
+        assert_xss_detected("<script\n>alert(1)</script>")
 
     def test_tab_in_event_handler(self):
         """Test tab character in event handler"""
-        is_safe, msg = detect_xss_patterns("<img onerror\t='alert(1)'>")
-        assert is_safe is False
+        assert_xss_detected("<img onerror\t='alert(1)'>")
 
     def test_unicode_lookalike_characters(self):
         """Test unicode characters that look like ASCII"""
         # Full-width less-than sign
         text = "＜script＞"  # These are full-width characters
-        is_safe, msg = detect_xss_patterns(text)
         # Should pass as these aren't real HTML tags
-        assert is_safe is True
+        assert_xss_safe(text)
 
     def test_very_long_attribute_value(self):
         """Test very long attribute value"""
-        long_value = "x" * 10000
-        text = f"<img src='{long_value}'>"
-        is_safe, msg = detect_xss_patterns(text)
-        assert is_safe is False  # Still detects the img tag
+        text = f"<img src='{LONG_ATTRIBUTE_VALUE}'>"
+        assert_xss_detected(text)  # Still detects the img tag
 
     def test_null_byte_injection(self):
         """Test null byte injection attempt"""
-        is_safe, msg = detect_xss_patterns("<scr\x00ipt>alert(1)</script>")
-        assert is_safe is False  # Should still detect
+        assert_xss_detected("<scr\x00ipt>alert(1)</script>")  # Should still detect
 
     def test_backslash_obfuscation(self):
         """Test backslash obfuscation"""
-        is_safe, msg = detect_xss_patterns("<scr\\ipt>alert(1)</script>")
-        assert is_safe is False  # Should still detect
+        assert_xss_detected("<scr\\ipt>alert(1)</script>")  # Should still detect
 
     def test_html_entity_without_semicolon(self):
         """Test HTML entity without trailing semicolon"""
-        is_safe, msg = detect_xss_patterns("&#60script&#62alert(1)&#60/script&#62")
-        assert is_safe is False  # Should decode and detect
-
-
-class TestOWASPXSSPayloads:
-    """
-    Comprehensive XSS payload tests based on OWASP XSS Filter Evasion Cheat Sheet.
-    https://cheatsheetseries.owasp.org/cheatsheets/XSS_Filter_Evasion_Cheat_Sheet.html
+        assert_xss_detected("&#60script&#62alert(1)&#60/script&#62")  # Should decode and detect
+
+    @pytest.mark.parametrize("opener", [
+        "<a ", "<svgx>", "<mathx><annotation-xml", "<!--", "data:x", "<linkx",
+    ])
+    def test_repeated_unterminated_openers(self, opener):
+        """Test repeated openers without a close don't rescan the text per opener"""
+        text = opener * (10000 // len(opener))
+        is_safe, msg = detect_xss_patterns(text)
+        assert is_safe is True or "data:" in msg
+        assert sanitize_text(text + "<b>x</b>").endswith("x")
+        # A real payload after the padding is still found
+        assert_xss_detected(text + "<svg onload=alert(1)>")
 
-    These payloads represent common attack vectors that security researchers
-    have identified as bypassing various filters.
-    """
 
-    # =========================================================================
+# Payloads from the OWASP XSS Filter Evasion Cheat Sheet that must be rejected
+OWASP_XSS_PAYLOADS = [
     # Script Tag Variations (OWASP)
-    # =========================================================================
-
-    def test_basic_script_tag(self):
-        """Basic XSS test case from OWASP"""
-        is_safe, _ = detect_xss_patterns("<SCRIPT SRC=http://xss.rocks/xss.js></SCRIPT>")
-        assert is_safe is False
-
-    def test_script_tag_with_img_src_error(self):
-        """Image XSS using JavaScript directive"""
-        is_safe, _ = detect_xss_patterns('<IMG SRC="javascript:alert(\'XSS\');">')
-        assert is_safe is False
-
-    def test_script_no_closing_tag(self):
-        """Malformed script tag without closing"""
-        is_safe, _ = detect_xss_patterns("<SCRIPT/XSS SRC=\"http://xss.rocks/xss.js\"></SCRIPT>")
-        assert is_safe is False
-
-    def test_script_with_extra_open_bracket(self):
-        """Attempt to bypass with extra open bracket"""
-        is_safe, _ = detect_xss_patterns("<<SCRIPT>alert(\"XSS\");//<</SCRIPT>")
-        assert is_safe is False
-
-    def test_script_end_title_tag(self):
-        """Breaking out of title tag"""
-        is_safe, _ = detect_xss_patterns("</TITLE><SCRIPT>alert(\"XSS\");</SCRIPT>")
-        assert is_safe is False
-
-    def test_script_with_spaces(self):
-        """Script with space before JavaScript"""
-        is_safe, _ = detect_xss_patterns("<SCRIPT SRC=http://xss.rocks/xss.js></SCRIPT>")
-        assert is_safe is False
-
-    def test_script_self_closing_tag(self):
-        """Self-closing script tag"""
-        is_safe, _ = detect_xss_patterns('<SCRIPT SRC="http://xss.rocks/xss.js"/>')
-        assert is_safe is False
-
-    def test_script_tag_case_insensitive(self):
-        """Case mixing attempt"""
-        is_safe, _ = detect_xss_patterns('<ScRiPt>alert("XSS")</sCrIpT>')
-        assert is_safe is False
-
-    def test_script_multiline_obfuscated(self):
-        """Newline in script tag"""
-        is_safe, _ = detect_xss_patterns('<SCR\nIPT>alert("XSS")</SCRIPT>')
-        assert is_safe is False
-
-    def test_script_with_tab(self):
-        """Tab character in script tag"""
-        is_safe, _ = detect_xss_patterns('<SCR\tIPT>alert("XSS")</SCRIPT>')
-        assert is_safe is False
-
-    def test_script_split_with_nulls(self):
-        """Null character injection in script tag"""
-        is_safe, _ = detect_xss_patterns('<SCR\x00IPT>alert("XSS")</SCRIPT>')
-        assert is_safe is False
-
-    # =========================================================================
+    pytest.param("<SCRIPT SRC=http://xss.rocks/xss.js></SCRIPT>", id="basic_script_tag"),
+    pytest.param('<IMG SRC="javascript:alert(\'XSS\');">', id="script_tag_with_img_src_error"),
+    pytest.param("<SCRIPT/XSS SRC=\"http://xss.rocks/xss.js\"></SCRIPT>", id="script_no_closing_tag"),
+    pytest.param("<<SCRIPT>alert(\"XSS\");//<</SCRIPT>", id="script_with_extra_open_bracket"),
+    pytest.param("</TITLE><SCRIPT>alert(\"XSS\");</SCRIPT>", id="script_end_title_tag"),
+    pytest.param("<SCRIPT SRC=http://xss.rocks/xss.js></SCRIPT>", id="script_with_spaces"),
+    pytest.param('<SCRIPT SRC="http://xss.rocks/xss.js"/>', id="script_self_closing_tag"),
+    pytest.param('<ScRiPt>alert("XSS")</sCrIpT>', id="script_tag_case_insensitive"),
+    pytest.param('<SCR\nIPT>alert("XSS")</SCRIPT>', id="script_multiline_obfuscated"),
+    pytest.param('<SCR\tIPT>alert("XSS")</SCRIPT>', id="script_with_tab"),
+    pytest.param('<SCR\x00IPT>alert("XSS")</SCRIPT>', id="script_split_with_nulls"),
     # Event Handler Injections (OWASP)
-    # =========================================================================
-
-    def test_img_onerror_basic(self):
-        """Basic IMG onerror XSS"""
-        is_safe, _ = detect_xss_patterns('<IMG SRC=x onerror="alert(\'XSS\')">')
-        assert is_safe is False
-
-    def test_img_onerror_no_quotes(self):
-        """IMG onerror without quotes"""
-        is_safe, _ = detect_xss_patterns("<IMG SRC=x onerror=alert('XSS')>")
-        assert is_safe is False
-
-    def test_body_onload(self):
-        """Body onload event handler"""
-        is_safe, _ = detect_xss_patterns('<BODY ONLOAD=alert("XSS")>')
-        assert is_safe is False
-
-    def test_body_background(self):
-        """Body background image XSS"""
-        is_safe, _ = detect_xss_patterns('<BODY BACKGROUND="javascript:alert(\'XSS\')">')
-        assert is_safe is False
-
-    def test_bgsound(self):
-        """BGSOUND tag XSS"""
-        is_safe, _ = detect_xss_patterns('<BGSOUND SRC="javascript:alert(\'XSS\');">')
-        assert is_safe is False
-
-    def test_img_dynsrc(self):
-        """IMG DYNSRC"""
-        is_safe, _ = detect_xss_patterns('<IMG DYNSRC="javascript:alert(\'XSS\')">')
-        assert is_safe is False
-
-    def test_img_lowsrc(self):
-        """IMG LOWSRC"""
-        is_safe, _ = detect_xss_patterns('<IMG LOWSRC="javascript:alert(\'XSS\')">')
-        assert is_safe is False
-
-    def test_br_style_expression(self):
-        """BR tag with CSS expression"""
-        is_safe, _ = detect_xss_patterns('<BR SIZE="&{alert(\'XSS\')}">')
-        # This uses SSI, may not be detected but good to test
-        # The function may or may not catch this specific variant
-        pass  # Allow either result for this edge case
-
-    def test_input_onfocus(self):
-        """INPUT with autofocus and onfocus"""
-        is_safe, _ = detect_xss_patterns('<INPUT TYPE="TEXT" ONFOCUS="alert(\'XSS\')" AUTOFOCUS>')
-        assert is_safe is False
-
-    def test_marquee_onstart(self):
-        """MARQUEE onstart event"""
-        is_safe, _ = detect_xss_patterns('<MARQUEE ONSTART="alert(\'XSS\')">test</MARQUEE>')
-        assert is_safe is False
-
-    def test_video_onerror(self):
-        """VIDEO with onerror"""
-        is_safe, _ = detect_xss_patterns('<VIDEO><SOURCE ONERROR="alert(\'XSS\')">')
-        assert is_safe is False
-
-    def test_details_ontoggle(self):
-        """DETAILS ontoggle event"""
-        is_safe, _ = detect_xss_patterns('<DETAILS OPEN ONTOGGLE="alert(\'XSS\')">')
-        assert is_safe is False
-
-    def test_select_onchange(self):
-        """SELECT with onchange"""
-        is_safe, _ = detect_xss_patterns('<SELECT ONCHANGE="alert(\'XSS\')"><OPTION>1</OPTION></SELECT>')
-        assert is_safe is False
-
-    def test_textarea_onfocus(self):
-        """TEXTAREA with autofocus onfocus"""
-        is_safe, _ = detect_xss_patterns('<TEXTAREA ONFOCUS="alert(\'XSS\')" AUTOFOCUS>')
-        assert is_safe is False
-
-    def test_audio_onloadeddata(self):
-        """AUDIO with various events"""
-        is_safe, _ = detect_xss_patterns('<AUDIO SRC=1 ONLOADEDDATA="alert(\'XSS\')">')
-        assert is_safe is False
-
-    def test_div_onmouseover(self):
-        """DIV with onmouseover requiring user interaction"""
-        is_safe, _ = detect_xss_patterns('<DIV ONMOUSEOVER="alert(\'XSS\')">test</DIV>')
-        assert is_safe is False
-
-    def test_button_onclick(self):
-        """BUTTON with onclick"""
-        is_safe, _ = detect_xss_patterns('<BUTTON ONCLICK="alert(\'XSS\')">Click</BUTTON>')
-        assert is_safe is False
-
-    def test_keygen_onfocus(self):
-        """KEYGEN onfocus (legacy)"""
-        is_safe, _ = detect_xss_patterns('<KEYGEN ONFOCUS="alert(\'XSS\')" AUTOFOCUS>')
-        assert is_safe is False
-
-    def test_object_onerror(self):
-        """OBJECT onerror event"""
-        is_safe, _ = detect_xss_patterns('<OBJECT DATA=1 ONERROR="alert(\'XSS\')">')
-        assert is_safe is False
-
-    # =========================================================================
+    pytest.param('<IMG SRC=x onerror="alert(\'XSS\')">', id="img_onerror_basic"),
+    pytest.param("<IMG SRC=x onerror=alert('XSS')>", id="img_onerror_no_quotes"),
+    pytest.param('<BODY ONLOAD=alert("XSS")>', id="body_onload"),
+    pytest.param('<BODY BACKGROUND="javascript:alert(\'XSS\')">', id="body_background"),
+    pytest.param('<BGSOUND SRC="javascript:alert(\'XSS\');">', id="bgsound"),
+    pytest.param('<IMG DYNSRC="javascript:alert(\'XSS\')">', id="img_dynsrc"),
+    pytest.param('<IMG LOWSRC="javascript:alert(\'XSS\')">', id="img_lowsrc"),
+    pytest.param('<INPUT TYPE="TEXT" ONFOCUS="alert(\'XSS\')" AUTOFOCUS>', id="input_onfocus"),
+    pytest.param('<MARQUEE ONSTART="alert(\'XSS\')">test</MARQUEE>', id="marquee_onstart"),
+    pytest.param('<VIDEO><SOURCE ONERROR="alert(\'XSS\')">', id="video_onerror"),
+    pytest.param('<DETAILS OPEN ONTOGGLE="alert(\'XSS\')">', id="details_ontoggle"),
+    pytest.param('<SELECT ONCHANGE="alert(\'XSS\')"><OPTION>1</OPTION></SELECT>', id="select_onchange"),
+    pytest.param('<TEXTAREA ONFOCUS="alert(\'XSS\')" AUTOFOCUS>', id="textarea_onfocus"),
+    pytest.param('<AUDIO SRC=1 ONLOADEDDATA="alert(\'XSS\')">', id="audio_onloadeddata"),
+    pytest.param('<DIV ONMOUSEOVER="alert(\'XSS\')">test</DIV>', id="div_onmouseover"),
+    pytest.param('<BUTTON ONCLICK="alert(\'XSS\')">Click</BUTTON>', id="button_onclick"),
+    pytest.param('<KEYGEN ONFOCUS="alert(\'XSS\')" AUTOFOCUS>', id="keygen_onfocus"),
+    pytest.param('<OBJECT DATA=1 ONERROR="alert(\'XSS\')">', id="object_onerror"),
     # Encoded Payloads (URL, HTML Entities) - OWASP
-    # =========================================================================
-
-    def test_url_encoded_script(self):
-        """URL encoded <script>"""
-        is_safe, _ = detect_xss_patterns('%3Cscript%3Ealert(1)%3C%2Fscript%3E')
-        assert is_safe is False
-
-    def test_double_url_encoded_script(self):
-        """Double URL encoded script tag"""
-        is_safe, _ = detect_xss_patterns('%253Cscript%253Ealert(1)%253C%252Fscript%253E')
-        assert is_safe is False
-
-    def test_html_decimal_entities(self):
-        """HTML decimal entities for script tag"""
-        is_safe, _ = detect_xss_patterns('&#60;script&#62;alert(1)&#60;/script&#62;')
-        assert is_safe is False
-
-    def test_html_hex_entities(self):
-        """HTML hex entities for script tag"""
-        is_safe, _ = detect_xss_patterns('&#x3C;script&#x3E;alert(1)&#x3C;/script&#x3E;')
-        assert is_safe is False
-
-    def test_html_entities_without_semicolon(self):
-        """HTML entities without trailing semicolons"""
-        is_safe, _ = detect_xss_patterns('&#60script&#62alert(1)&#60/script&#62')
-        assert is_safe is False
-
-    def test_mixed_encoding(self):
-        """Mixed URL and HTML encoding"""
-        is_safe, _ = detect_xss_patterns('%3C&#115;cript%3Ealert(1)%3C/script%3E')
-        assert is_safe is False
-
-    def test_javascript_uri_encoded(self):
-        """URL encoded javascript: URI"""
-        is_safe, _ = detect_xss_patterns('<a href="%6A%61%76%61%73%63%72%69%70%74%3Aalert(1)">click</a>')
-        assert is_safe is False
-
-    def test_html_entity_javascript(self):
-        """HTML entity encoded javascript:"""
-        is_safe, _ = detect_xss_patterns('<a href="&#106;&#97;&#118;&#97;&#115;&#99;&#114;&#105;&#112;&#116;&#58;alert(1)">x</a>')
-        assert is_safe is False
-
-    def test_unicode_encoding(self):
-        """Unicode escaped characters"""
-        is_safe, _ = detect_xss_patterns('<script>\\u0061lert(1)</script>')
-        assert is_safe is False
-
-    def test_hex_encoding_event_handler(self):
-        """Hex encoded event handler"""
-        is_safe, _ = detect_xss_patterns('<img src=x &#111;nerror="alert(1)">')
-        assert is_safe is False
-
-    def test_base64_data_uri(self):
-        """Base64 encoded JavaScript in data URI"""
-        is_safe, _ = detect_xss_patterns('<a href="data:text/html;base64,PHNjcmlwdD5hbGVydCgxKTwvc2NyaXB0Pg==">x</a>')
-        assert is_safe is False
-
-    def test_long_utf8_encoding(self):
-        """Long UTF-8 encoding of < (OWASP)"""
-        is_safe, _ = detect_xss_patterns('&#x0000003C;script&#x0000003E;alert(1)')
-        # Should detect after normalizing the long hex codes
-        assert is_safe is False
-
-    # =========================================================================
+    pytest.param('%3Cscript%3Ealert(1)%3C%2Fscript%3E', id="url_encoded_script"),
+    pytest.param('%253Cscript%253Ealert(1)%253C%252Fscript%253E', id="double_url_encoded_script"),
+    pytest.param('&#60;script&#62;alert(1)&#60;/script&#62;', id="html_decimal_entities"),
+    pytest.param('&#x3C;script&#x3E;alert(1)&#x3C;/script&#x3E;', id="html_hex_entities"),
+    pytest.param('&#60script&#62alert(1)&#60/script&#62', id="html_entities_without_semicolon"),
+    pytest.param('%3C&#115;cript%3Ealert(1)%3C/script%3E', id="mixed_encoding"),
+    pytest.param('<a href="%6A%61%76%61%73%63%72%69%70%74%3Aalert(1)">click</a>', id="javascript_uri_encoded"),
+    pytest.param('<a href="&#106;&#97;&#118;&#97;&#115;&#99;&#114;&#105;&#112;&#116;&#58;alert(1)">x</a>', id="html_entity_javascript"),
+    pytest.param('<script>\\u0061lert(1)</script>', id="unicode_encoding"),
+    pytest.param('<img src=x &#111;nerror="alert(1)">', id="hex_encoding_event_handler"),
+    pytest.param('<a href="data:text/html;base64,PHNjcmlwdD5hbGVydCgxKTwvc2NyaXB0Pg==">x</a>', id="base64_data_uri"),
+    pytest.param('&#x0000003C;script&#x0000003E;alert(1)', id="long_utf8_encoding"),
     # SVG/MathML Vector Attacks (OWASP)
-    # =========================================================================
-
-    def test_svg_onload(self):
-        """SVG with onload event"""
-        is_safe, _ = detect_xss_patterns('<svg onload="alert(1)">')
-        assert is_safe is False
-
-    def test_svg_with_script_tag(self):
-        """SVG containing script element"""
-        is_safe, _ = detect_xss_patterns('<svg><script>alert(1)</script></svg>')
-        assert is_safe is False
-
-    def test_svg_animate_href(self):
-        """SVG animate with javascript href"""
-        is_safe, _ = detect_xss_patterns('<svg><animate xlink:href="javascript:alert(1)"/></svg>')
-        assert is_safe is False
-
-    def test_svg_animate_onclick(self):
-        """SVG animate with onclick"""
-        is_safe, _ = detect_xss_patterns('<svg><animate onclick="alert(1)"/></svg>')
-        assert is_safe is False
-
-    def test_svg_set_event(self):
-        """SVG set element with event"""
-        is_safe, _ = detect_xss_patterns('<svg><set onbegin="alert(1)"/></svg>')
-        assert is_safe is False
-
-    def test_svg_foreignobject(self):
-        """SVG foreignObject injection"""
-        is_safe, _ = detect_xss_patterns('<svg><foreignObject><script>alert(1)</script></foreignObject></svg>')
-        assert is_safe is False
-
-    def test_svg_image_xlink(self):
-        """SVG image with xlink:href"""
-        is_safe, _ = detect_xss_patterns('<svg><image xlink:href="javascript:alert(1)"></svg>')
-        assert is_safe is False
-
-    def test_svg_use_xlink(self):
-        """SVG use element with xlink"""
-        is_safe, _ = detect_xss_patterns('<svg><use xlink:href="javascript:alert(1)"></svg>')
-        assert is_safe is False
-
-    def test_svg_a_xlink(self):
-        """SVG a element with xlink:href"""
-        is_safe, _ = detect_xss_patterns('<svg><a xlink:href="javascript:alert(1)">click</a></svg>')
-        assert is_safe is False
-
-    def test_math_element_xss(self):
-        """MathML-based XSS"""
-        is_safe, _ = detect_xss_patterns('<math><maction actiontype="statusline#http://google.com" xlink:href="javascript:alert(1)">click</maction></math>')
-        assert is_safe is False
-
-    def test_math_annotation_xml_svg(self):
-        """MathML annotation-xml with SVG"""
-        is_safe, _ = detect_xss_patterns('<math><annotation-xml encoding="text/html"><svg onload="alert(1)"></svg></annotation-xml></math>')
-        assert is_safe is False
-
-    def test_svg_desc_foreignobject(self):
-        """SVG desc with foreignObject"""
-        is_safe, _ = detect_xss_patterns('<svg><desc><foreignObject><script>alert(1)</script></foreignObject></desc></svg>')
-        assert is_safe is False
-
-    # =========================================================================
+    pytest.param('<svg onload="alert(1)">', id="svg_onload"),
+    pytest.param('<svg><script>alert(1)</script></svg>', id="svg_with_script_tag"),
+    pytest.param('<svg><animate xlink:href="javascript:alert(1)"/></svg>', id="svg_animate_href"),
+    pytest.param('<svg><animate onclick="alert(1)"/></svg>', id="svg_animate_onclick"),
+    pytest.param('<svg><set onbegin="alert(1)"/></svg>', id="svg_set_event"),
+    pytest.param('<svg><foreignObject><script>alert(1)</script></foreignObject></svg>', id="svg_foreignobject"),
+    pytest.param('<svg><image xlink:href="javascript:alert(1)"></svg>', id="svg_image_xlink"),
+    pytest.param('<svg><use xlink:href="javascript:alert(1)"></svg>', id="svg_use_xlink"),
+    pytest.param('<svg><a xlink:href="javascript:alert(1)">click</a></svg>', id="svg_a_xlink"),
+    pytest.param('<math><maction actiontype="statusline#http://google.com" xlink:href="javascript:alert(1)">click</maction></math>', id="math_element_xss"),
+    pytest.param('<math><annotation-xml encoding="text/html"><svg onload="alert(1)"></svg></annotation-xml></math>', id="math_annotation_xml_svg"),
+    pytest.param('<svg><desc><foreignObject><script>alert(1)</script></foreignObject></desc></svg>', id="svg_desc_foreignobject"),
     # CSS Expression Attacks (OWASP) - IE Legacy
-    # =========================================================================
-
-    def test_css_expression_basic(self):
-        """Basic CSS expression (IE)"""
-        is_safe, _ = detect_xss_patterns('<DIV STYLE="width: expression(alert(\'XSS\'));">')
-        assert is_safe is False
-
-    def test_css_expression_background_image(self):
-        """CSS expression in background-image"""
-        is_safe, _ = detect_xss_patterns('<DIV STYLE="background-image: expression(alert(\'XSS\'));">')
-        assert is_safe is False
-
-    def test_css_expression_list_style(self):
-        """CSS expression in list-style"""
-        is_safe, _ = detect_xss_patterns('<DIV STYLE="list-style: expression(alert(\'XSS\'));">')
-        assert is_safe is False
-
-    def test_css_expression_with_linebreaks(self):
-        """CSS expression with line breaks"""
-        is_safe, _ = detect_xss_patterns('<DIV STYLE="width:\nexpr\nession(alert(\'XSS\'));">')
-        # May or may not catch all obfuscation, but test the attempt
-        pass  # Edge case
-
-    def test_css_url_javascript(self):
-        """CSS url() with javascript"""
-        is_safe, _ = detect_xss_patterns('<DIV STYLE="background: url(javascript:alert(\'XSS\'));">')
-        assert is_safe is False
-
-    def test_css_behavior(self):
-        """CSS behavior property (IE)"""
-        is_safe, _ = detect_xss_patterns('<DIV STYLE="behavior: url(xss.htc);">')
-        assert is_safe is False
-
-    def test_css_moz_binding(self):
-        """CSS -moz-binding (Firefox legacy)"""
-        is_safe, _ = detect_xss_patterns('<DIV STYLE="-moz-binding: url(xss.xml#xss);">')
-        assert is_safe is False
-
-    def test_css_import(self):
-        """CSS @import"""
-        is_safe, _ = detect_xss_patterns('<STYLE>@import "xss.css";</STYLE>')
-        assert is_safe is False
-
-    def test_style_tag_with_expression(self):
-        """STYLE tag with expression"""
-        is_safe, _ = detect_xss_patterns('<STYLE>body{width:expression(alert("XSS"))}</STYLE>')
-        assert is_safe is False
-
-    # =========================================================================
+    pytest.param('<DIV STYLE="width: expression(alert(\'XSS\'));">', id="css_expression_basic"),
+    pytest.param('<DIV STYLE="background-image: expression(alert(\'XSS\'));">', id="css_expression_background_image"),
+    pytest.param('<DIV STYLE="list-style: expression(alert(\'XSS\'));">', id="css_expression_list_style"),
+    pytest.param('<DIV STYLE="background: url(javascript:alert(\'XSS\'));">', id="css_url_javascript"),
+    pytest.param('<DIV STYLE="behavior: url(xss.htc);">', id="css_behavior"),
+    pytest.param('<DIV STYLE="-moz-binding: url(xss.xml#xss);">', id="css_moz_binding"),
+    pytest.param('<STYLE>@import "xss.css";</STYLE>', id="css_import"),
+    pytest.param('<STYLE>body{width:expression(alert("XSS"))}</STYLE>', id="style_tag_with_expression"),
     # Additional OWASP Vectors
-    # =========================================================================
-
-    def test_meta_refresh_redirect(self):
-        """Meta refresh redirect"""
-        is_safe, _ = detect_xss_patterns('<META HTTP-EQUIV="refresh" CONTENT="0;url=javascript:alert(\'XSS\');">')
-        assert is_safe is False
-
-    def test_meta_refresh_data_uri(self):
-        """Meta refresh with data URI"""
-        is_safe, _ = detect_xss_patterns('<META HTTP-EQUIV="refresh" CONTENT="0;url=data:text/html;base64,PHNjcmlwdD5hbGVydCgxKTwvc2NyaXB0Pg==">')
-        assert is_safe is False
-
-    def test_iframe_src_javascript(self):
-        """IFRAME with javascript src"""
-        is_safe, _ = detect_xss_patterns('<IFRAME SRC="javascript:alert(\'XSS\');">')
-        assert is_safe is False
-
-    def test_iframe_srcdoc(self):
-        """IFRAME with srcdoc"""
-        is_safe, _ = detect_xss_patterns('<IFRAME SRCDOC="<script>alert(1)</script>">')
-        assert is_safe is False
-
-    def test_embed_src_javascript(self):
-        """EMBED with javascript src"""
-        is_safe, _ = detect_xss_patterns('<EMBED SRC="javascript:alert(\'XSS\');">')
-        assert is_safe is False
-
-    def test_object_data_javascript(self):
-        """OBJECT with javascript data"""
-        is_safe, _ = detect_xss_patterns('<OBJECT DATA="javascript:alert(\'XSS\');">')
-        assert is_safe is False
-
-    def test_frameset_onload(self):
-        """FRAMESET onload"""
-        is_safe, _ = detect_xss_patterns('<FRAMESET ONLOAD="alert(\'XSS\')">')
-        assert is_safe is False
-
-    def test_table_background(self):
-        """TABLE BACKGROUND javascript"""
-        is_safe, _ = detect_xss_patterns('<TABLE BACKGROUND="javascript:alert(\'XSS\')">')
-        assert is_safe is False
-
-    def test_td_background(self):
-        """TD BACKGROUND javascript"""
-        is_safe, _ = detect_xss_patterns('<TD BACKGROUND="javascript:alert(\'XSS\')">')
-        assert is_safe is False
-
-    def test_link_stylesheet(self):
-        """LINK stylesheet injection"""
-        is_safe, _ = detect_xss_patterns('<LINK REL="stylesheet" HREF="javascript:alert(\'XSS\');">')
-        assert is_safe is False
-
-    def test_base_href_javascript(self):
-        """BASE href javascript"""
-        is_safe, _ = detect_xss_patterns('<BASE HREF="javascript:alert(\'XSS\');//">')
-        assert is_safe is False
-
-    def test_applet_tag(self):
-        """APPLET tag (legacy)"""
-        is_safe, _ = detect_xss_patterns('<APPLET CODE="xss.class" CODEBASE="http://xss.rocks/">')
-        assert is_safe is False
-
-    def test_vbscript_image(self):
-        """VBScript in image (IE)"""
-        is_safe, _ = detect_xss_patterns('<IMG SRC="vbscript:msgbox(\'XSS\')">')
-        assert is_safe is False
-
-    def test_livescript(self):
-        """Livescript protocol (legacy Netscape)"""
-        is_safe, _ = detect_xss_patterns('<IMG SRC="livescript:[code]">')
-        assert is_safe is False
-
-    def test_form_action_javascript(self):
-        """FORM action javascript"""
-        is_safe, _ = detect_xss_patterns('<FORM ACTION="javascript:alert(\'XSS\')">')
-        assert is_safe is False
-
-    def test_formaction_attribute(self):
-        """formaction attribute"""
-        is_safe, _ = detect_xss_patterns('<BUTTON FORMACTION="javascript:alert(\'XSS\')">Submit</BUTTON>')
-        assert is_safe is False
-
-    def test_isindex_prompt_injection(self):
-        """ISINDEX tag (legacy)"""
-        is_safe, _ = detect_xss_patterns('<ISINDEX TYPE="IMAGE" SRC="javascript:alert(\'XSS\');">')
-        assert is_safe is False
-
-    def test_input_image_src(self):
-        """INPUT type=image with javascript src"""
-        is_safe, _ = detect_xss_patterns('<INPUT TYPE="IMAGE" SRC="javascript:alert(\'XSS\');">')
-        assert is_safe is False
-
-    def test_xml_data_island(self):
-        """XML data island (IE)"""
-        is_safe, _ = detect_xss_patterns('<XML ID="xss"><I><B><IMG SRC="javas<!-- -->cript:alert(\'XSS\')"></B></I></XML>')
-        assert is_safe is False
-
-    def test_html_plus_time(self):
-        """HTML+TIME (IE)"""
-        is_safe, _ = detect_xss_patterns('<HTML><BODY><?xml:namespace prefix="t" ns="urn:schemas-microsoft-com:time"><?import namespace="t" implementation="#default#time2"><t:set attributeName="innerHTML" to="XSS"></BODY></HTML>')
-        # Edge case - test for dangerous tags at minimum
-        is_safe2, _ = detect_xss_patterns('<t:set attributeName="innerHTML">')
-        # May or may not detect this specific legacy IE vector
-
-    # =========================================================================
+    pytest.param('<META HTTP-EQUIV="refresh" CONTENT="0;url=javascript:alert(\'XSS\');">', id="meta_refresh_redirect"),
+    pytest.param('<META HTTP-EQUIV="refresh" CONTENT="0;url=data:text/html;base64,PHNjcmlwdD5hbGVydCgxKTwvc2NyaXB0Pg==">', id="meta_refresh_data_uri"),
+    pytest.param('<IFRAME SRC="javascript:alert(\'XSS\');">', id="iframe_src_javascript"),
+    pytest.param('<IFRAME SRCDOC="<script>alert(1)</script>">', id="iframe_srcdoc"),
+    pytest.param('<EMBED SRC="javascript:alert(\'XSS\');">', id="embed_src_javascript"),
+    pytest.param('<OBJECT DATA="javascript:alert(\'XSS\');">', id="object_data_javascript"),
+    pytest.param('<FRAMESET ONLOAD="alert(\'XSS\')">', id="frameset_onload"),
+    pytest.param('<TABLE BACKGROUND="javascript:alert(\'XSS\')">', id="table_background"),
+    pytest.param('<TD BACKGROUND="javascript:alert(\'XSS\')">', id="td_background"),
+    pytest.param('<LINK REL="stylesheet" HREF="javascript:alert(\'XSS\');">', id="link_stylesheet"),
+    pytest.param('<BASE HREF="javascript:alert(\'XSS\');//">', id="base_href_javascript"),
+    pytest.param('<APPLET CODE="xss.class" CODEBASE="http://xss.rocks/">', id="applet_tag"),
+    pytest.param('<IMG SRC="vbscript:msgbox(\'XSS\')">', id="vbscript_image"),
+    pytest.param('<IMG SRC="livescript:[code]">', id="livescript"),
+    pytest.param('<FORM ACTION="javascript:alert(\'XSS\')">', id="form_action_javascript"),
+    pytest.param('<BUTTON FORMACTION="javascript:alert(\'XSS\')">Submit</BUTTON>', id="formaction_attribute"),
+    pytest.param('<ISINDEX TYPE="IMAGE" SRC="javascript:alert(\'XSS\');">', id="isindex_prompt_injection"),
+    pytest.param('<INPUT TYPE="IMAGE" SRC="javascript:alert(\'XSS\');">', id="input_image_src"),
+    pytest.param('<XML ID="xss"><I><B><IMG SRC="javas<!-- -->cript:alert(\'XSS\')"></B></I></XML>', id="xml_data_island"),
     # DOM Clobbering Attacks
-    # =========================================================================
-
-    def test_dom_clobber_form_document(self):
-        """DOM clobbering with form named document"""
-        is_safe, _ = detect_xss_patterns('<form id="document"></form>')
-        assert is_safe is False
-
-    def test_dom_clobber_input_location(self):
-        """DOM clobbering with input named location"""
-        is_safe, _ = detect_xss_patterns('<input name="location" value="http://evil.com">')
-        assert is_safe is False
-
-    def test_dom_clobber_img_window(self):
-        """DOM clobbering with img named window"""
-        is_safe, _ = detect_xss_patterns('<img name="window">')
-        assert is_safe is False
+    pytest.param('<form id="document"></form>', id="dom_clobber_form_document"),
+    pytest.param('<input name="location" value="http://evil.com">', id="dom_clobber_input_location"),
+    pytest.param('<img name="window">', id="dom_clobber_img_window"),
+    pytest.param('<a id="document"></a>', id="dom_clobber_anchor_document"),
+    # Bypasses and Edge Cases
+    pytest.param('<scr\x00ipt>alert(1)</script>', id="null_byte_in_script"),
+    pytest.param('<script>a]lert(1)</script>', id="backslash_obfuscation"),
+    pytest.param('<script><!--alert(1)//--></script>', id="comment_in_script_tag"),
+    pytest.param('<img src="x" " onerror="alert(1)">', id="split_across_attributes"),
+    pytest.param('<a href="JaVaScRiPt:alert(1)">click</a>', id="protocol_handler_casing"),
+    pytest.param('<a href="java\tscript:alert(1)">x</a>', id="protocol_with_tabs"),
+    pytest.param('<a href="java\nscript:alert(1)">x</a>', id="protocol_with_newlines"),
+    pytest.param('<img src="data:image/svg+xml,<svg onload=alert(1)>">', id="data_uri_svg"),
+    pytest.param('<a href="data:text/html,<script>alert(1)</script>">click</a>', id="xss_via_content_type"),
+]
+
+# (payload, expected): legacy or partial vectors. expected=None means either
+# verdict is acceptable; the result only has to be well formed.
+OWASP_EDGE_CASES = [
+    pytest.param('<BR SIZE="&{alert(\'XSS\')}">', None, id="br_style_expression"),
+    pytest.param('<DIV STYLE="width:\nexpr\nession(alert(\'XSS\'));">', None, id="css_expression_with_linebreaks"),
+    pytest.param('<HTML><BODY><?xml:namespace prefix="t" ns="urn:schemas-microsoft-com:time"><?import namespace="t" implementation="#default#time2"><t:set attributeName="innerHTML" to="XSS"></BODY></HTML>', None, id="html_plus_time_1"),
+    pytest.param('<t:set attributeName="innerHTML">', None, id="html_plus_time_2"),
+    pytest.param('";alert(1);//', True, id="quotes_escaped_context"),
+]
 
-    def test_dom_clobber_anchor_document(self):
-        """DOM clobbering with anchor named document"""
-        is_safe, _ = detect_xss_patterns('<a id="document"></a>')
-        assert is_safe is False
 
-    # =========================================================================
-    # Bypasses and Edge Cases
-    # =========================================================================
+class TestOWASPXSSPayloads:
+    """
+    Comprehensive XSS payload tests based on OWASP XSS Filter Evasion Cheat Sheet.
+    https://cheatsheetseries.owasp.org/cheatsheets/XSS_Filter_Evasion_Cheat_Sheet.html
 
-    def test_null_byte_in_script(self):
-        """Null byte injection in script tag"""
-        is_safe, _ = detect_xss_patterns('<scr\x00ipt>alert(1)</script>')
-        assert is_safe is False
+    These payloads represent common attack vectors that security researchers
+    have identified as bypassing various filters.
+    """
 
-    def test_backslash_obfuscation(self):
-        """Backslash obfuscation attempt"""
-        is_safe, _ = detect_xss_patterns('<script>a]lert(1)</script>')
-        assert is_safe is False
-
-    def test_comment_in_script_tag(self):
-        """HTML comment within script tag"""
-        is_safe, _ = detect_xss_patterns('<script><!--alert(1)//--></script>')
-        assert is_safe is False
-
-    def test_split_across_attributes(self):
-        """XSS split across attributes"""
-        is_safe, _ = detect_xss_patterns('<img src="x" " onerror="alert(1)">')
-        assert is_safe is False
-
-    def test_quotes_escaped_context(self):
-        """Quote escaped context breaking"""
-        is_safe, _ = detect_xss_patterns('";alert(1);//')
-        # Just JavaScript code, not in HTML context - should be safe
-        assert is_safe is True
-
-    def test_protocol_handler_casing(self):
-        """Mixed case protocol handler"""
-        is_safe, _ = detect_xss_patterns('<a href="JaVaScRiPt:alert(1)">click</a>')
-        assert is_safe is False
-
-    def test_protocol_with_tabs(self):
-        """Tabs in javascript protocol"""
-        is_safe, _ = detect_xss_patterns('<a href="java\tscript:alert(1)">x</a>')
-        assert is_safe is False
-
-    def test_protocol_with_newlines(self):
-        """Newlines in javascript protocol"""
-        is_safe, _ = detect_xss_patterns('<a href="java\nscript:alert(1)">x</a>')
-        assert is_safe is False
-
-    def test_data_uri_svg(self):
-        """Data URI with SVG containing script"""
-        is_safe, _ = detect_xss_patterns('<img src="data:image/svg+xml,<svg onload=alert(1)>">')
-        assert is_safe is False
-
-    def test_xss_via_content_type(self):
-        """Data URI specifying text/html"""
-        is_safe, _ = detect_xss_patterns('<a href="data:text/html,<script>alert(1)</script>">click</a>')
-        assert is_safe is False
+    @pytest.mark.parametrize("payload", OWASP_XSS_PAYLOADS)
+    def test_owasp_dangerous(self, payload):
+        """Test OWASP evasion payloads are rejected"""
+        assert_xss_detected(payload)
+
+    @pytest.mark.parametrize("payload,expected", OWASP_EDGE_CASES)
+    def test_owasp_edge_case(self, payload, expected):
+        """Test edge-case payloads give a consistent verdict"""
+        is_safe, msg = detect_xss_patterns(payload)
+        assert is_safe is (msg is None)
+        if expected is not None:
+            assert is_safe is expected
 
 
 class TestRealWorldExamples:
@@ -4,6 +4,7 @@ import os
 import sys
 import logging
 import asyncio
+import secrets
 from urllib.parse import parse_qs, urlparse
 from datetime import datetime
 
@@ -16,7 +17,10 @@ sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '../
 from db import run_async, get_connection
 import asyncpg
 
-# Import validation functions
+# Import validation functions (stdlib-only, loaded once per cold start)
+from text_validation import validate_title, validate_narrative
+from source_validation import validate_all_sources
+
 try:
     from utils import is_drone_incident
 except ImportError:
@@ -37,8 +41,21 @@ except ImportError as e:
     OpenRouterEmbeddingDeduplicator = None
     OpenRouterLLMDeduplicator = None
 
+# orjson parses the request bytes natively; its JSONDecodeError subclasses
+# json.JSONDecodeError, so the error handling below is the same either way
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    def json_loads(body):
+        # Decode explicitly: json.loads(bytes) would also accept UTF-16/32 and
+        # a UTF-8 BOM, which orjson (and the handler before it) rejects
+        return json.loads(body.decode('utf-8'))
+
 logger = logging.getLogger(__name__)
 
+# Read once per cold start; function instances are restarted when env vars change
+_INGEST_TOKEN = os.getenv('INGEST_TOKEN')
+
 def parse_datetime(dt_string):
     """Parse ISO datetime string to datetime object"""
     from datetime import timezone
@@ -483,8 +500,7 @@ async def insert_incident(incident_data):
 class handler(BaseHTTPRequestHandler):
     def do_POST(self):
         # Check authorization with security best practices
-        import secrets
-        expected_token = os.getenv('INGEST_TOKEN')
+        expected_token = _INGEST_TOKEN
         if not expected_token:
             error_msg = (
                 "Server configuration error: INGEST_TOKEN not set. "
@@ -511,7 +527,8 @@ class handler(BaseHTTPRequestHandler):
 
         token = auth_header.replace('Bearer ', '')
         # Use constant-time comparison to prevent timing attacks
-        if not secrets.compare_digest(token, expected_token):
+        # (bytes, since compare_digest rejects non-ASCII str)
+        if not secrets.compare_digest(token.encode(), expected_token.encode()):
             self.send_error(403, "Invalid token")
             return
 
@@ -524,7 +541,7 @@ class handler(BaseHTTPRequestHandler):
         body = self.rfile.read(content_length)
 
         try:
-            incident_data = json.loads(body.decode('utf-8'))
+            incident_data = json_loads(body)
         except json.JSONDecodeError:
             self.send_error(400, "Invalid JSON")
             return
@@ -537,8 +554,6 @@ class handler(BaseHTTPRequestHandler):
             return
 
         # Validate and sanitize title field (CRITICAL for XSS prevention)
-        from text_validation import validate_title, validate_narrative
-
         title_valid, sanitized_title, title_error = validate_title(incident_data.get('title'))
         if not title_valid:
             logger.error(f"Title validation failed: {title_error}")
@@ -620,8 +635,6 @@ class handler(BaseHTTPRequestHandler):
 
         # Validate source URLs are real and verifiable (CRITICAL for journalists)
         if incident_data.get('sources'):
-            from source_validation import validate_all_sources
-            
             all_valid, validation_errors = validate_all_sources(incident_data['sources'])
             
             if not all_valid: